@@ -5,6 +5,7 @@ Display recent Graylog logs in Device and VirtualMachine detail pages.
 """
 
 import logging
+import time
 
 from netbox.plugins import PluginConfig
 
@@ -31,46 +32,67 @@ class GraylogConfig(PluginConfig):
 
     # Default configuration values
     default_settings = {
-        "graylog_url": "http://graylog:9000",
+        "graylog_url": "http://graylog:9000",  # One URL, a comma-separated string or a list of API nodes
         "graylog_api_token": "",
         "log_limit": 50,
         "time_range": 3600,  # 1 hour in seconds
         "timeout": 10,  # API timeout in seconds
+        "latency_budget": 2.0,  # Seconds before tabs and the widget show what they have (0 disables)
+        "fast_time_range": 900,  # Window of the fast first-stage query in seconds
+        "fast_log_limit": 20,  # Messages in the fast first-stage query
         "cache_timeout": 60,  # Cache results for 60 seconds
+        "local_cache_size": 16 * 1024 * 1024,  # Per-process L1 cache size in bytes (0 disables)
+        "local_cache_timeout": 5,  # Max lifetime of L1 entries in seconds
+        "use_views_api": True,  # One Views/Search API request for messages, total and facets
         "search_field": "source",  # Field to search (source, gl2_remote_ip)
         "use_fqdn": True,  # Use FQDN for hostname matching
         "fallback_to_ip": True,  # Fall back to primary IP if hostname not found
+        "collapse_duplicates": False,  # Fold runs of repeated messages into one row by default
+        "message_preview_length": 300,  # Characters of each message kept in list results
+        "stream_max_bytes": 16 * 1024 * 1024,  # Stop decoding a search response after this many bytes (0 disables)
+        "stream_max_messages": 0,  # Stop decoding after this many messages (0 keeps every message returned)
+        "message_cache_timeout": 3600,  # Cache individually fetched full messages for 1 hour
+        "sources_index": True,  # Consult an index of known sources before searching
+        "sources_index_range": 86400,  # Window the sources index is built over (seconds)
+        "sources_index_refresh": 300,  # Rebuild the sources index every 5 minutes
+        "sources_index_size": 50000,  # Maximum sources/IPs fetched per refresh
+        "sources_index_absence_age": 60,  # Max index age (seconds) to skip searching unknown hosts
+        "interface_log_limit": 500,  # Device messages scanned for the Interface tab
+        "correlation_max_neighbors": 16,  # Cabled neighbors included in the Correlated view
+        "max_concurrent_searches": 8,  # Worker threads for concurrent searches
+        "health_check_interval": 30,  # Seconds between node health checks with multiple nodes (0 disables)
     }
 
+    # Seconds spent in ready(), set once the app is loaded
+    ready_duration = None
+
     def ready(self):
-        """Register endpoint view if netbox_endpoints is available."""
+        """Register the dashboard widget and, if netbox_endpoints is available, the endpoint view."""
+        started = time.perf_counter()
         super().ready()
         from . import widgets  # noqa: F401
 
         self._register_endpoint_views()
+        # Reported by ``manage.py graylog_startup_report``
+        self.ready_duration = time.perf_counter() - started
+        logger.debug(f"netbox_graylog ready() took {self.ready_duration * 1000:.1f} ms")
 
     def _register_endpoint_views(self):
         """Register Graylog Logs tab for Endpoints if plugin is installed."""
-        import sys
-
-        # Quick check if netbox_endpoints is available
-        if "netbox_endpoints" not in sys.modules:
-            try:
-                import importlib.util
+        from .utils import get_endpoint_model
 
-                if importlib.util.find_spec("netbox_endpoints") is None:
-                    logger.debug("netbox_endpoints not installed, skipping endpoint view registration")
-                    return
-            except Exception:
-                logger.debug("netbox_endpoints not available, skipping endpoint view registration")
-                return
+        Endpoint = get_endpoint_model()
+        if Endpoint is None:
+            logger.debug("netbox_endpoints not installed, skipping endpoint view registration")
+            return
 
         try:
             from django.shortcuts import render
             from netbox.views import generic
-            from netbox_endpoints.models import Endpoint
             from utilities.views import ViewTab, register_model_view
 
+            from .utils import content_params
+
             @register_model_view(Endpoint, name="graylog_logs", path="logs")
             class EndpointGraylogLogsView(generic.ObjectView):
                 """Display Graylog logs for an Endpoint with async loading."""
@@ -87,7 +109,6 @@ class GraylogConfig(PluginConfig):
 
                 def get(self, request, pk):
                     endpoint = Endpoint.objects.get(pk=pk)
-                    time_range = request.GET.get("range", "")
                     return render(
                         request,
                         self.template_name,
@@ -95,13 +116,11 @@ class GraylogConfig(PluginConfig):
                             "object": endpoint,
                             "tab": self.tab,
                             "loading": True,
-                            "time_range_param": time_range,
+                            "content_params": content_params(request),
                         },
                     )
 
             logger.info("Registered Graylog Logs tab for Endpoint model")
-        except ImportError:
-            logger.debug("netbox_endpoints not installed, skipping endpoint view registration")
         except Exception as e:
             logger.warning(f"Could not register endpoint views: {e}")
 
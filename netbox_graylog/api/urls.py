@@ -0,0 +1,25 @@
+"""
+REST API routing for NetBox Graylog Plugin.
+
+Mounted by NetBox under /api/plugins/graylog/.
+"""
+
+from django.urls import path
+
+from . import views
+from .views import ENDPOINTS_PLUGIN_INSTALLED
+
+urlpatterns = [
+    path("summary/", views.LogSummaryAPIView.as_view(), name="summary"),
+    path("devices/logs/", views.DeviceLogsAPIView.as_view(), name="device_logs_bulk"),
+    path("devices/<int:pk>/logs/", views.DeviceLogsAPIView.as_view(), name="device_logs"),
+    path("virtual-machines/logs/", views.VMLogsAPIView.as_view(), name="vm_logs_bulk"),
+    path("virtual-machines/<int:pk>/logs/", views.VMLogsAPIView.as_view(), name="vm_logs"),
+]
+
+# Add endpoint URLs if netbox_endpoints is installed
+if ENDPOINTS_PLUGIN_INSTALLED:
+    urlpatterns += [
+        path("endpoints/logs/", views.EndpointLogsAPIView.as_view(), name="endpoint_logs_bulk"),
+        path("endpoints/<int:pk>/logs/", views.EndpointLogsAPIView.as_view(), name="endpoint_logs"),
+    ]
@@ -0,0 +1,217 @@
+"""
+REST API views for NetBox Graylog Plugin.
+
+Expose the same cached log lookups as the UI tabs as compact JSON for
+automation. Responses are gzip-compressed when the client accepts it.
+"""
+
+from dcim.models import Device
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from virtualization.models import VirtualMachine
+
+from ..graylog_client import get_client, get_executor
+from ..processing import collapse_duplicates
+from ..utils import bind_cursor, cursor_owner, get_bool_param, get_endpoint_model
+
+# netbox_endpoints integration, resolved once from the app registry
+Endpoint = get_endpoint_model()
+ENDPOINTS_PLUGIN_INSTALLED = Endpoint is not None
+
+# Message fields a client may select with ``fields=``
+MESSAGE_FIELDS = ("id", "index", "timestamp", "source", "facility", "level", "message", "truncated")
+# Added to every message when ``collapse=1``
+COLLAPSE_FIELDS = ("count", "first_timestamp", "last_timestamp")
+DEFAULT_MESSAGE_FIELDS = ("id", "index", "timestamp", "source", "facility", "level", "message")
+
+MAX_LIMIT = 500
+MAX_BULK_OBJECTS = 100
+
+
+def serialize_messages(messages, fields):
+    """
+    Flatten normalized messages to compact dicts with only the selected fields.
+
+    Args:
+        messages: Normalized messages from the Graylog client
+        fields: Field names from ``MESSAGE_FIELDS``
+
+    Returns:
+        List of dicts; fields missing from a message are omitted
+    """
+    serialized = []
+    for log in messages:
+        message = log["message"]
+        row = {}
+        for field in fields:
+            if field == "id":
+                value = message.get("message_id")
+            elif field == "index":
+                value = log.get("index")
+            else:
+                value = message.get(field)
+            if value not in (None, ""):
+                row[field] = value
+        serialized.append(row)
+    return serialized
+
+
+@method_decorator(gzip_page, name="dispatch")
+class GraylogLogsAPIView(APIView):
+    """
+    Base view returning Graylog logs for one object or a list of objects.
+
+    ``GET <objects>/<pk>/logs/`` returns one result; ``GET <objects>/logs/?id=1&id=2``
+    returns results for up to ``MAX_BULK_OBJECTS`` objects keyed by id, searched
+    concurrently (``max_concurrent_searches`` threads).
+
+    Query parameters:
+        range: Time range in seconds (default from config)
+        limit: Messages per object, 1-500 (default ``log_limit``)
+        fields: Comma-separated message fields (default all but ``truncated``)
+        cursor: ``next_cursor`` of a previous response (single object only)
+        collapse: ``1`` to fold runs of repeated messages (default ``collapse_duplicates``)
+    """
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+    queryset = None
+    # Relations the host lookup reads, loaded with the bulk query
+    related_fields = ()
+
+    def get_logs(self, client, obj, time_range, limit):
+        """Fetch the first page of logs for ``obj``."""
+        raise NotImplementedError
+
+    def _int_param(self, request, name, minimum, maximum):
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: "Must be an integer."})
+        if not minimum <= value <= maximum:
+            raise ValidationError({name: f"Must be between {minimum} and {maximum}."})
+        return value
+
+    def _fields_param(self, request):
+        value = request.query_params.get("fields")
+        if not value:
+            return DEFAULT_MESSAGE_FIELDS
+        fields = tuple(field.strip() for field in value.split(",") if field.strip())
+        unknown = [field for field in fields if field not in MESSAGE_FIELDS]
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}"})
+        return fields
+
+    def serialize(self, obj, result, fields, collapse=False):
+        messages = result.get("messages", [])
+        if collapse:
+            messages = collapse_duplicates(messages)
+            fields = fields + COLLAPSE_FIELDS
+        data = {
+            "id": obj.pk,
+            "name": str(obj),
+            "query": result.get("query"),
+            "search_type": result.get("search_type"),
+            "time_range": result.get("time_range"),
+            "total": result.get("total_results", 0),
+            # Cursors only page through the logs of the object they were handed out for
+            "next_cursor": bind_cursor(result.get("next_cursor"), cursor_owner(obj)),
+            "truncated": result.get("truncated"),
+            "facets": result.get("facets"),
+            "error": result.get("error"),
+            "messages": serialize_messages(messages, fields),
+        }
+        return {key: value for key, value in data.items() if value is not None}
+
+    def get(self, request, pk=None):
+        time_range = self._int_param(request, "range", 60, 30 * 86400)
+        limit = self._int_param(request, "limit", 1, MAX_LIMIT)
+        fields = self._fields_param(request)
+        collapse = get_bool_param(request, "collapse", get_client().config.get("collapse_duplicates", False))
+        cursor = request.query_params.get("cursor")
+        queryset = self.queryset.restrict(request.user, "view")
+        client = get_client()
+
+        if pk is not None:
+            obj = queryset.filter(pk=pk).first()
+            if obj is None:
+                raise NotFound()
+            if cursor:
+                result = client.get_page(cursor, limit=limit, owner=cursor_owner(obj))
+            else:
+                result = self.get_logs(client, obj, time_range, limit)
+            return Response(self.serialize(obj, result, fields, collapse))
+
+        if cursor:
+            raise ValidationError({"cursor": "Cursors are only supported for a single object."})
+        ids = request.query_params.getlist("id")
+        if not ids:
+            raise ValidationError({"id": "Provide one or more object ids."})
+        if len(ids) > MAX_BULK_OBJECTS:
+            raise ValidationError({"id": f"At most {MAX_BULK_OBJECTS} objects per request."})
+        try:
+            ids = [int(pk) for pk in ids]
+        except ValueError:
+            raise ValidationError({"id": "Ids must be integers."})
+
+        # Searches run concurrently on the shared search threads; related rows
+        # are loaded up front so the workers never touch the database
+        objects = list(queryset.filter(pk__in=ids).select_related(*self.related_fields))
+        logs = get_executor().map(lambda obj: self.get_logs(client, obj, time_range, limit), objects)
+        results = {obj.pk: self.serialize(obj, result, fields, collapse) for obj, result in zip(objects, logs)}
+        return Response({"count": len(results), "results": results})
+
+
+class DeviceLogsAPIView(GraylogLogsAPIView):
+    """Graylog logs for Devices."""
+
+    queryset = Device.objects.all()
+    related_fields = ("virtual_chassis", "primary_ip4")
+
+    def get_logs(self, client, device, time_range, limit):
+        return client.get_logs_for_device(device, time_range=time_range, limit=limit)
+
+
+class VMLogsAPIView(GraylogLogsAPIView):
+    """Graylog logs for VirtualMachines."""
+
+    queryset = VirtualMachine.objects.all()
+    related_fields = ("primary_ip4",)
+
+    def get_logs(self, client, vm, time_range, limit):
+        return client.get_logs_for_vm(vm, time_range=time_range, limit=limit)
+
+
+@method_decorator(gzip_page, name="dispatch")
+class LogSummaryAPIView(APIView):
+    """Aggregate log volume and error/warning counts (same data as the dashboard widget)."""
+
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+
+    def get(self, request):
+        try:
+            time_range = int(request.query_params.get("range", 3600))
+        except ValueError:
+            raise ValidationError({"range": "Must be an integer."})
+        if not 60 <= time_range <= 30 * 86400:
+            raise ValidationError({"range": f"Must be between 60 and {30 * 86400}."})
+        summary = get_client().get_log_summary(time_range=time_range)
+        return Response({"time_range": time_range, **summary})
+
+
+# Endpoint views - only available if netbox_endpoints is installed
+if ENDPOINTS_PLUGIN_INSTALLED:
+
+    class EndpointLogsAPIView(GraylogLogsAPIView):
+        """Graylog logs for Endpoints."""
+
+        queryset = Endpoint.objects.all()
+
+        def get_logs(self, client, endpoint, time_range, limit):
+            return client.get_logs_for_endpoint(endpoint, time_range=time_range, limit=limit)
@@ -0,0 +1,214 @@
+"""
+Two-tier cache for Graylog results
+
+A small per-process LRU (L1) sits in front of the Django cache (L2). L1 hits
+skip the network round trip to the shared cache backend and the unpickling of
+large results. L1 entries live for at most ``local_cache_timeout`` seconds so
+workers converge on the shared L2 copy quickly, and never past the L2 entry's
+own expiry. With L1 enabled, values are written to L2 together with their
+pickled size and expiry, so filling L1 from an L2 hit doesn't pickle them
+again just to measure them.
+"""
+
+import copy
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache bounded by total pickled size in bytes."""
+
+    def __init__(self, max_bytes, timeout):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound for the summed size of all entries
+            timeout: Maximum lifetime of an entry in seconds
+        """
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (expires, size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return ``(True, value)`` on a fresh hit, ``(False, None)`` otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, size, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.size -= size
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, timeout=None, size=None):
+        """
+        Store a value, evicting least recently used entries to stay in budget.
+
+        Args:
+            key: Cache key
+            value: Value to store; callers must not mutate it afterwards
+            timeout: Lifetime in seconds, capped at the L1 timeout
+            size: Pickled size of the value if already known
+        """
+        timeout = self.timeout if timeout in (None, DEFAULT_TIMEOUT) else min(timeout, self.timeout)
+        if timeout <= 0:
+            return
+        if size is None:
+            size = _pickled_size(value)
+            if size is None:
+                return
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (time.monotonic() + timeout, size, value)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SizedValue:
+    """Shared cache entry carrying the value's pickled size and expiry, recorded once when written."""
+
+    __slots__ = ("value", "size", "expires")
+
+    def __init__(self, value, size, expires=None):
+        self.value = value
+        self.size = size
+        self.expires = expires  # Epoch seconds, None if it never expires
+
+
+def _unwrap(entry):
+    """Return ``(value, size, expires)`` of a shared cache entry; size and expires are None if unknown."""
+    if isinstance(entry, SizedValue):
+        return entry.value, entry.size, entry.expires
+    return entry, None, None
+
+
+def _local_timeout(expires):
+    """L1 lifetime for an L2 entry: never past the entry's own expiry."""
+    return None if expires is None else expires - time.time()
+
+
+def _pickled_size(value):
+    """Pickled size of ``value`` in bytes, or None if it can't be pickled."""
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+
+class TieredCache:
+    """Django-cache-like facade that consults the local LRU before the shared cache."""
+
+    def __init__(self):
+        self._local = None
+        self._configured = False
+
+    @property
+    def local(self):
+        """The L1 cache, or None when disabled (``local_cache_size`` of 0)."""
+        if not self._configured:
+            config = settings.PLUGINS_CONFIG.get("netbox_graylog", {})
+            max_bytes = config.get("local_cache_size", 16 * 1024 * 1024)
+            timeout = config.get("local_cache_timeout", 5)
+            if max_bytes and timeout:
+                self._local = LocalCache(max_bytes, timeout)
+            self._configured = True
+        return self._local
+
+    @staticmethod
+    def _copy(value):
+        # Callers annotate results (search_type, cached, ...) at the top level,
+        # so hand out a shallow copy instead of the shared L1 object.
+        return copy.copy(value) if isinstance(value, dict) else value
+
+    def get(self, key, default=None):
+        local = self.local
+        if local is not None:
+            hit, value = local.get(key)
+            if hit:
+                return self._copy(value)
+
+        value, size, expires = _unwrap(shared_cache.get(key))
+        if value is None:
+            return default
+        if local is not None:
+            local.set(key, value, _local_timeout(expires), size=size)
+            return self._copy(value)
+        return value
+
+    def get_many(self, keys):
+        found = {}
+        missing = []
+        local = self.local
+        for key in keys:
+            hit, value = local.get(key) if local is not None else (False, None)
+            if hit:
+                found[key] = self._copy(value)
+            else:
+                missing.append(key)
+
+        if missing:
+            for key, entry in shared_cache.get_many(missing).items():
+                value, size, expires = _unwrap(entry)
+                if local is not None:
+                    local.set(key, value, _local_timeout(expires), size=size)
+                found[key] = self._copy(value)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        if self.local is None:
+            shared_cache.set(key, value, timeout)
+            return
+        # Measured here once, so L1 fills from L2 hits never pickle the value
+        # again, and stamped with its expiry so they never outlive the L2 entry
+        size = _pickled_size(value)
+        expiry = shared_cache.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+        expires = None if expiry is None else time.time() + expiry
+        shared_cache.set(key, SizedValue(value, size, expires), timeout)
+        if size is not None:
+            self.local.set(key, self._copy(value), timeout, size=size)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        """Set ``key`` in the shared cache only if it's missing; True if it was added. Bypasses L1, for locks."""
+        return shared_cache.add(key, value, timeout)
+
+    def delete(self, key):
+        shared_cache.delete(key)
+        if self.local is not None:
+            self.local.delete(key)
+
+
+# Shared instance used throughout the plugin
+cache = TieredCache()
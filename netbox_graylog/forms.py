@@ -3,16 +3,19 @@ Forms for NetBox Graylog Plugin settings.
 """
 
 from django import forms
+from django.core.validators import URLValidator
+
+from .node_pool import parse_node_urls
 
 
 class GraylogSettingsForm(forms.Form):
     """Form for configuring Graylog plugin settings."""
 
-    graylog_url = forms.URLField(
+    graylog_url = forms.CharField(
         label="Graylog URL",
-        help_text="Base URL for Graylog API (e.g., http://graylog:9000)",
+        help_text="Base URL for Graylog API (e.g., http://graylog:9000). Separate multiple API nodes with commas.",
         required=True,
-        widget=forms.URLInput(attrs={"class": "form-control", "placeholder": "http://graylog:9000"}),
+        widget=forms.TextInput(attrs={"class": "form-control", "placeholder": "http://graylog:9000"}),
     )
 
     graylog_api_token = forms.CharField(
@@ -96,3 +99,26 @@ class GraylogSettingsForm(forms.Form):
         initial=True,
         widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
     )
+
+    health_check_interval = forms.IntegerField(
+        label="Health Check Interval",
+        help_text="Seconds between health checks when multiple API nodes are configured (0 disables)",
+        required=False,
+        initial=30,
+        min_value=0,
+        max_value=3600,
+        widget=forms.NumberInput(attrs={"class": "form-control"}),
+    )
+
+    def __init__(self, *args, initial=None, **kwargs):
+        if initial and not isinstance(initial.get("graylog_url", ""), str):
+            initial = {**initial, "graylog_url": ", ".join(parse_node_urls(initial["graylog_url"]))}
+        super().__init__(*args, initial=initial, **kwargs)
+
+    def clean_graylog_url(self):
+        """Validate each comma-separated node URL."""
+        urls = parse_node_urls(self.cleaned_data["graylog_url"])
+        validate = URLValidator()
+        for url in urls:
+            validate(url)
+        return ", ".join(urls)
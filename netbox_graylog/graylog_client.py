@@ -2,16 +2,101 @@
 Graylog API Client
 
 Handles communication with Graylog's REST API for log retrieval.
+
+``requests`` is imported on first use rather than at module import, so
+loading the plugin (URL checks, management commands, RQ workers) doesn't pay
+for the HTTP stack until something actually talks to Graylog.
 """
 
+import hashlib
 import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
 
-import requests
 from django.conf import settings
-from django.core.cache import cache
+
+from .caching import cache
+from .interfaces import build_interface_index, index_messages, mentioned_keys
+from .node_pool import NodePool, parse_node_urls
+from .processing import count_facets, merge_timelines
+from .sources import SourcesIndex
+from .streaming import decode_search
+from .utils import decode_cursor, encode_cursor, window_start
 
 logger = logging.getLogger(__name__)
 
+# Versioned: the pickled SourcesIndex layout changed with prefix matching
+SOURCES_INDEX_CACHE_KEY = "graylog_sources_index_v2"
+SOURCES_INDEX_LOCK_KEY = "graylog_sources_index_lock"
+
+# A sources index is served for this many refresh intervals while its
+# replacement is built, then dropped (searches fall back to wildcards)
+SOURCES_INDEX_MAX_AGE = 3
+
+# More matching sources than this are searched with the wildcard instead
+MAX_INDEXED_SOURCES = 20
+
+# Fields requested for message lists; the full message is fetched on demand
+LIST_FIELDS = ("_id", "timestamp", "source", "facility", "level", "application_name", "message")
+
+# Facets computed alongside the message list: name -> (field, number of values)
+FACET_FIELDS = {
+    "levels": ("level", 8),
+    "facilities": ("facility", 5),
+    "programs": ("application_name", 5),
+}
+
+# Range button windows; a cached result for a larger one can answer a smaller one
+SUBSUMING_RANGES = (900, 3600, 14400, 86400, 604800)
+
+# How long the last good dashboard summary is kept as a fallback
+LAST_SUMMARY_TIMEOUT = 86400
+
+# Absolute deadline (time.monotonic()) for outbound calls made by this thread
+_deadline = threading.local()
+
+
+class BudgetExhausted(Exception):
+    """Raised instead of calling Graylog once the current latency budget is used up."""
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Bound every Graylog call made inside the block by a shared latency budget.
+
+    Each outbound request gets ``min(timeout, time left)`` as its timeout, and
+    no request is started once the budget is spent. A nested deadline never
+    extends an enclosing one. ``deadline(0)`` allows only cache hits.
+
+    Args:
+        seconds: Budget for the whole block
+    """
+    with deadline_at(time.monotonic() + seconds):
+        yield
+
+
+@contextmanager
+def deadline_at(when):
+    """Like ``deadline`` with an absolute ``time.monotonic()`` value (None for no deadline)."""
+    previous = getattr(_deadline, "at", None)
+    if when is None or (previous is not None and previous < when):
+        when = previous
+    _deadline.at = when
+    try:
+        yield
+    finally:
+        _deadline.at = previous
+
+
+def remaining_time():
+    """Seconds left in the current thread's latency budget, or None without one."""
+    when = getattr(_deadline, "at", None)
+    return None if when is None else when - time.monotonic()
+
 
 class GraylogClient:
     """Client for interacting with Graylog API."""
@@ -19,10 +104,23 @@ class GraylogClient:
     def __init__(self):
         """Initialize the Graylog client with plugin configuration."""
         self.config = settings.PLUGINS_CONFIG.get("netbox_graylog", {})
-        self.base_url = self.config.get("graylog_url", "http://graylog:9000")
+        self.node_urls = parse_node_urls(self.config.get("graylog_url", "http://graylog:9000"))
+        self.base_url = self.node_urls[0] if self.node_urls else ""
         self.api_token = self.config.get("graylog_api_token", "")
         self.timeout = self.config.get("timeout", 10)
         self.cache_timeout = self.config.get("cache_timeout", 60)
+        self.pool = NodePool(
+            self.node_urls,
+            health_check_interval=self.config.get("health_check_interval", 30),
+            timeout=min(self.timeout, 5),
+        )
+        # Cleared on first 404/405 so older Graylog versions only pay for the probe once
+        self.views_api = self.config.get("use_views_api", True)
+
+    @property
+    def external_url(self):
+        """Graylog URL for browser links (first API node unless overridden)."""
+        return (self.config.get("graylog_external_url") or self.base_url).rstrip("/")
 
     def _get_auth(self):
         """Get authentication tuple for requests."""
@@ -36,15 +134,148 @@ class GraylogClient:
             "X-Requested-By": "NetBox-Graylog-Plugin",
         }
 
-    def search_logs(self, query, time_range=None, limit=None, fields=None):
+    def _get(self, path, params=None, stream=False):
+        """Send a GET request to the Graylog cluster (see ``_request``)."""
+        return self._request("GET", path, params=params, stream=stream)
+
+    def _post(self, path, json=None, stream=False):
+        """Send a POST request with a JSON body to the Graylog cluster (see ``_request``)."""
+        return self._request("POST", path, json=json, stream=stream)
+
+    def _request(self, method, path, params=None, json=None, stream=False):
+        """
+        Send a request to the least loaded healthy Graylog node.
+
+        Connect timeouts, connection errors and gateway errors (502/503/504)
+        mark the node down and the request is retried on the next node, so a
+        single failed node is transparent to callers. A read timeout is raised
+        as is: Graylog only answers once a search has finished, so it means an
+        expensive query that would be as slow on any other node. Inside a
+        ``deadline`` block the timeout is capped by the time left in the budget.
+
+        Args:
+            method: HTTP method
+            path: API path starting with ``/api/``
+            params: Query parameters
+            json: JSON request body
+            stream: Leave the body unread for incremental decoding; the
+                caller must close the response
+
+        Returns:
+            requests.Response
+
+        Raises:
+            requests.exceptions.RequestException: if every node failed
+            BudgetExhausted: if the latency budget ran out
+        """
+        import requests
+
+        tried = set()
+        last_error = None
+        while True:
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise BudgetExhausted("Latency budget exhausted")
+            node = self.pool.acquire(exclude=tried)
+            if node is None:
+                raise last_error or requests.exceptions.ConnectionError("No Graylog API nodes configured")
+            tried.add(node.url)
+            timeout = self.timeout if remaining is None else min(self.timeout, remaining)
+            started = time.monotonic()
+            try:
+                response = requests.request(
+                    method,
+                    f"{node.url}{path}",
+                    params=params,
+                    json=json,
+                    headers=self._get_headers(),
+                    auth=self._get_auth(),
+                    timeout=timeout,
+                    stream=stream,
+                    verify=False,  # Allow self-signed certs
+                )
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if timeout < self.timeout and isinstance(e, requests.exceptions.Timeout):
+                    # Cut short by the latency budget; the node isn't at fault
+                    self.pool.release(node)
+                    raise BudgetExhausted("Latency budget exhausted") from e
+                if isinstance(e, requests.exceptions.ReadTimeout):
+                    # The node accepted the request; the search itself is slow
+                    self.pool.release(node)
+                    raise
+                self.pool.release(node, failed=True)
+                last_error = e
+                continue
+
+            if response.status_code in (502, 503, 504) and len(tried) < len(self.pool.nodes):
+                response.close()
+                self.pool.release(node, failed=True)
+                last_error = requests.exceptions.HTTPError(response=response)
+                continue
+
+            self.pool.release(node, elapsed=time.monotonic() - started)
+            return response
+
+    def _error_result(self, e):
+        """
+        Translate an exception from an API call into an error result.
+
+        Args:
+            e: Exception raised by ``_get`` or response handling
+
+        Returns:
+            dict with 'error' string and empty 'messages' list
+        """
+        import requests
+
+        if isinstance(e, BudgetExhausted):
+            logger.debug("Graylog search abandoned: latency budget exhausted")
+            return {"error": str(e), "messages": [], "budget_exhausted": True}
+        if isinstance(e, requests.exceptions.ReadTimeout):
+            logger.error(f"Graylog search timed out after {self.timeout}s")
+            return {"error": f"Search timed out after {self.timeout}s; try a shorter time range", "messages": []}
+        if isinstance(e, requests.exceptions.Timeout):
+            logger.error(f"Timeout connecting to Graylog: {', '.join(self.node_urls)}")
+            return {"error": "Connection timeout", "messages": []}
+        if isinstance(e, requests.exceptions.ConnectionError):
+            logger.error(f"Connection error to Graylog: {e}")
+            return {"error": f"Connection failed: {', '.join(self.node_urls)}", "messages": []}
+        if isinstance(e, requests.exceptions.HTTPError):
+            logger.error(f"HTTP error from Graylog: {e}")
+            if e.response.status_code == 401:
+                return {
+                    "error": "Authentication failed - check API token",
+                    "messages": [],
+                }
+            elif e.response.status_code == 403:
+                return {
+                    "error": "Permission denied - check token permissions",
+                    "messages": [],
+                }
+            elif e.response.status_code == 404:
+                return {"error": "Not found", "messages": []}
+            return {"error": f"HTTP error: {e.response.status_code}", "messages": []}
+        logger.exception(f"Unexpected error querying Graylog: {e}")
+        return {"error": str(e), "messages": []}
+
+    def search_logs(self, query, time_range=None, limit=None, fields=None, cursor=None):
         """
         Search for logs in Graylog.
 
+        Only the fields needed for the log table are requested by default, and
+        long messages are cut to a preview; use ``get_message`` for the full text.
+
+        The first page is a relative search. If more messages exist, the result
+        carries a ``next_cursor`` for ``get_page``: later pages are absolute
+        searches ending at the last timestamp shown (keyset pagination), so
+        deep pages never need an offset scan.
+
         Args:
             query: Lucene query string (e.g., "source:hostname")
             time_range: Time range in seconds (default from config)
             limit: Maximum number of results (default from config)
-            fields: List of fields to return (optional)
+            fields: List of fields to return (default ``LIST_FIELDS``)
+            cursor: Decoded cursor (see ``utils.decode_cursor``) for later pages
 
         Returns:
             dict with 'messages' list or 'error' string
@@ -54,150 +285,804 @@ class GraylogClient:
 
         time_range = time_range or self.config.get("time_range", 3600)
         limit = limit or self.config.get("log_limit", 50)
+        fields = tuple(fields) if fields else LIST_FIELDS
 
         # Check cache first
-        cache_key = f"graylog_logs_{query}_{time_range}_{limit}"
+        cache_key = _logs_cache_key(query, time_range, limit, fields)
+        if cursor:
+            cache_key += f"_{cursor['from']}_{cursor['to']}_{','.join(sorted(cursor['seen_ids']))}"
         cached = cache.get(cache_key)
         if cached is not None:
             logger.debug(f"Returning cached results for query: {query}")
             return cached
 
-        endpoint = f"{self.base_url}/api/search/universal/relative"
+        if not cursor:
+            subsumed = self._subsumed_result(query, time_range, limit, fields)
+            if subsumed is not None:
+                logger.debug(f"Serving {time_range}s window from a cached larger window for query: {query}")
+                cache.set(cache_key, subsumed, max(1, int(self.cache_timeout - (time.time() - subsumed["fetched_at"]))))
+                return subsumed
 
         params = {
             "query": query,
-            "range": time_range,
             "limit": limit,
             "sort": "timestamp:desc",
+            "fields": ",".join(fields),
         }
-
-        if fields:
-            params["fields"] = ",".join(fields)
+        if cursor:
+            path = "/api/search/universal/absolute"
+            # ``to`` is inclusive, so over-fetch by the messages already shown at that timestamp
+            params.update({"from": cursor["from"], "to": cursor["to"], "limit": limit + len(cursor["seen_ids"])})
+            start = cursor["from"]
+        else:
+            path = "/api/search/universal/relative"
+            params["range"] = time_range
+            start = window_start(time_range)
 
         try:
-            response = requests.get(
-                endpoint,
-                params=params,
-                headers=self._get_headers(),
-                auth=self._get_auth(),
-                timeout=self.timeout,
-                verify=False,  # Allow self-signed certs
-            )
-            response.raise_for_status()
+            data = None
+            # Later pages only need messages, so only the first page pays for facets
+            if self.views_api and not cursor:
+                data = self._views_search(query, time_range, limit, fields)
+            if data is None:
+                response = self._get(path, params=params, stream=True)
+                try:
+                    response.raise_for_status()
+                    data, messages, truncated = self._decode_search(response, ("messages",))
+                finally:
+                    response.close()
+                data.update(messages=messages, truncated=truncated)
+
+            messages = data["messages"]
+            truncated = data["truncated"]
+            # An early stop can cut off the total; there may be more either way
+            total_reported = data.get("total_results") is not None
+            total_results = data["total_results"] if total_reported else len(messages)
+
+            skipped = 0
+            if cursor:
+                page = [log for log in messages if not _already_seen(log, cursor)]
+                skipped = len(messages) - len(page)
+                messages = page[:limit]
 
-            data = response.json()
             result = {
-                "messages": data.get("messages", []),
-                "total_results": data.get("total_results", 0),
+                "messages": messages,
+                "total_results": total_results,
                 "time": data.get("time", 0),
                 "query": query,
                 "time_range": time_range,
+                "next_cursor": None,
+                "facets": data.get("facets"),
+                "fetched_at": time.time(),
             }
+            if truncated:
+                result["truncated"] = True
+            if not total_reported:
+                # ``total_results`` is only a lower bound
+                result["total_estimated"] = True
+            if messages and (truncated or total_results > skipped + len(messages)):
+                result["next_cursor"] = _next_cursor(query, time_range, start, messages, cursor)
+            result["fingerprint"] = fingerprint_result(result)
 
             # Cache the results
             cache.set(cache_key, result, self.cache_timeout)
 
             return result
 
-        except requests.exceptions.Timeout:
-            logger.error(f"Timeout connecting to Graylog: {self.base_url}")
-            return {"error": "Connection timeout", "messages": []}
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"Connection error to Graylog: {e}")
-            return {"error": f"Connection failed: {self.base_url}", "messages": []}
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error from Graylog: {e}")
-            if e.response.status_code == 401:
-                return {
-                    "error": "Authentication failed - check API token",
-                    "messages": [],
+        except Exception as e:
+            return self._error_result(e)
+
+    def _subsumed_result(self, query, time_range, limit, fields):
+        """
+        Answer a first page from a cached result for a larger window.
+
+        A cached larger-window result for the same query, limit and fields
+        covers the smaller window when it is complete (Graylog reported a total
+        no larger than the messages returned) or when its oldest message is
+        older than the smaller window's cutoff. Newest first, the messages
+        after the cutoff are then exactly the smaller window's messages.
+        Results whose decoding stopped early are never used.
+
+        Args:
+            query: Lucene query string
+            time_range: Requested window in seconds
+            limit: Requested number of messages
+            fields: Requested fields
+
+        Returns:
+            Result dict for ``time_range`` built locally, or None
+        """
+        larger = [window for window in SUBSUMING_RANGES if window > time_range]
+        if not larger:
+            return None
+        keys = {_logs_cache_key(query, window, limit, fields): window for window in larger}
+        found = cache.get_many(list(keys))
+        if not found:
+            return None
+
+        now = time.time()
+        cutoff = window_start(time_range)
+        # Smallest covering window first: fewest messages to filter
+        for key in sorted(found, key=keys.get):
+            source = found[key]
+            messages = source.get("messages") or []
+            fetched_at = source.get("fetched_at")
+            # A response cut off early proves nothing about what it didn't decode
+            if source.get("error") or source.get("truncated") or fetched_at is None:
+                continue
+            # The larger window must start at or before the requested one
+            if fetched_at - keys[key] > now - time_range:
+                continue
+            complete = not source.get("total_estimated") and source.get("total_results", 0) <= len(messages)
+            if not complete and not (messages and (messages[-1]["message"].get("timestamp") or "") < cutoff):
+                continue
+
+            # Graylog timestamps share one fixed-width UTC format, so they compare as strings
+            window = [log for log in messages if (log["message"].get("timestamp") or "") >= cutoff]
+            result = {
+                "messages": window,
+                "total_results": len(window),
+                "time": 0,
+                "query": query,
+                "time_range": time_range,
+                "next_cursor": None,
+                "facets": count_facets(window, FACET_FIELDS) if source.get("facets") is not None else None,
+                "fetched_at": fetched_at,
+            }
+            result["fingerprint"] = fingerprint_result(result)
+            return result
+        return None
+
+    def _views_search(self, query, time_range, limit, fields):
+        """
+        Run one Views/Search API request carrying several search types.
+
+        A single round trip returns the message list, the total, per-level
+        counts and the top facilities and programs for the query.
+
+        Args:
+            query: Lucene query string
+            time_range: Time range in seconds
+            limit: Maximum number of messages
+            fields: Message fields to return
+
+        Returns:
+            dict with ``messages``, ``total_results``, ``time`` and ``facets``,
+            or None if this Graylog has no Views API
+
+        Raises:
+            requests.exceptions.RequestException: on API failures
+            ValueError: if Graylog reports a query error
+        """
+        search_types = [
+            {
+                "id": "messages",
+                "type": "messages",
+                "limit": limit,
+                "offset": 0,
+                "sort": [{"field": "timestamp", "order": "DESC"}],
+                # Like universal search, return only the listed fields, not
+                # whole messages with their full_message
+                "fields": list(fields),
+            }
+        ]
+        for facet, (field, size) in FACET_FIELDS.items():
+            search_types.append(_pivot_search_type(facet, field, size))
+        body = {
+            "queries": [
+                {
+                    "id": "q",
+                    "query": {"type": "elasticsearch", "query_string": query},
+                    "timerange": {"type": "relative", "range": time_range},
+                    "search_types": search_types,
                 }
-            elif e.response.status_code == 403:
-                return {
-                    "error": "Permission denied - check token permissions",
-                    "messages": [],
+            ]
+        }
+
+        started = time.monotonic()
+        response = self._post("/api/views/search/sync", json=body, stream=True)
+        try:
+            if response.status_code in (404, 405):
+                logger.info("Graylog Views API not available, using universal search")
+                self.views_api = False
+                return None
+            response.raise_for_status()
+            document, messages, truncated = self._decode_search(
+                response, ("results", "q", "search_types", "messages", "messages")
+            )
+        finally:
+            response.close()
+
+        result = document.get("results", {}).get("q", {})
+        errors = result.get("errors") or []
+        if errors:
+            raise ValueError(errors[0].get("description", "Graylog search failed"))
+
+        results = result.get("search_types", {})
+        return {
+            "messages": messages,
+            "total_results": results.get("messages", {}).get("total_results"),
+            "truncated": truncated,
+            "time": int((time.monotonic() - started) * 1000),
+            "facets": {facet: _pivot_counts(results.get(facet, {})) for facet in FACET_FIELDS},
+        }
+
+    def _decode_search(self, response, items_path):
+        """
+        Decode a streamed search response into normalized messages.
+
+        Messages are normalized one at a time as they are parsed, and decoding
+        stops at ``stream_max_bytes`` decoded bytes or ``stream_max_messages``
+        messages (0 disables either budget).
+
+        Returns:
+            ``(document, messages, truncated)`` (see ``streaming.decode_search``)
+        """
+        preview_length = self.config.get("message_preview_length", 300)
+        return decode_search(
+            response,
+            items_path,
+            lambda log: normalize_message(log, preview_length),
+            max_bytes=self.config.get("stream_max_bytes", 16 * 1024 * 1024),
+            max_messages=self.config.get("stream_max_messages", 0),
+        )
+
+    def get_page(self, token, limit=None, owner=None):
+        """
+        Fetch the page of messages following a ``next_cursor``.
+
+        Args:
+            token: Cursor string from a previous result's ``next_cursor``
+            limit: Maximum number of results (default from config)
+            owner: ``utils.cursor_owner`` of the object the cursor must be bound to
+
+        Returns:
+            dict with 'messages' list or 'error' string
+        """
+        cursor = decode_cursor(token, owner)
+        if cursor is None:
+            return {"error": "Invalid cursor", "messages": []}
+        return self.search_logs(cursor["query"], time_range=cursor["time_range"], limit=limit, cursor=cursor)
+
+    def get_message(self, index, message_id):
+        """
+        Fetch a single message with all of its fields.
+
+        Messages are immutable once indexed, so each one is cached
+        individually for ``message_cache_timeout`` seconds.
+
+        Args:
+            index: Elasticsearch/OpenSearch index holding the message
+            message_id: Graylog message ``_id``
+
+        Returns:
+            dict with 'message' dict and 'index', or 'error' string
+        """
+        if not self.api_token:
+            return {"error": "Graylog API token not configured", "messages": []}
+
+        cache_key = f"graylog_message_{index}_{message_id}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self._get(f"/api/messages/{quote(index, safe='')}/{quote(message_id, safe='')}")
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            return self._error_result(e)
+
+        message = data.get("message", {})
+        result = {
+            "index": data.get("index", index),
+            "message": {**message, "message_id": message.get("_id", message_id)},
+        }
+        cache.set(cache_key, result, self.config.get("message_cache_timeout", 3600))
+        return result
+
+    def _terms(self, field, time_range, size, query="*"):
+        """
+        Run a terms aggregation over a field.
+
+        Uses a Views API pivot; the legacy terms endpoint (removed in Graylog
+        4.0) is only tried when this Graylog has no Views API.
+
+        Args:
+            field: Message field to aggregate
+            time_range: Time range in seconds
+            size: Maximum number of terms to return
+            query: Lucene query restricting the messages
+
+        Returns:
+            dict with ``terms`` ({value: count}) and ``other`` (count of messages
+            outside the returned terms)
+
+        Raises:
+            requests.exceptions.RequestException: on any API failure
+            ValueError: if Graylog reports a query error
+        """
+        if self.views_api:
+            terms = self._views_terms(field, time_range, size, query)
+            if terms is not None:
+                return terms
+
+        params = {"field": field, "query": query, "range": time_range, "size": size}
+        response = self._get("/api/search/universal/relative/terms", params=params)
+        response.raise_for_status()
+        data = response.json()
+        return {"terms": data.get("terms", {}), "other": data.get("other", 0)}
+
+    def _views_terms(self, field, time_range, size, query):
+        """
+        Terms aggregation as a Views API pivot (see ``_terms``).
+
+        Returns:
+            dict like ``_terms``, or None if this Graylog has no Views API
+        """
+        body = {
+            "queries": [
+                {
+                    "id": "q",
+                    "query": {"type": "elasticsearch", "query_string": query},
+                    "timerange": {"type": "relative", "range": time_range},
+                    "search_types": [_pivot_search_type("terms", field, size)],
                 }
-            return {"error": f"HTTP error: {e.response.status_code}", "messages": []}
+            ]
+        }
+        response = self._post("/api/views/search/sync", json=body)
+        if response.status_code in (404, 405):
+            logger.info("Graylog Views API not available, using the legacy terms endpoint")
+            self.views_api = False
+            return None
+        response.raise_for_status()
+
+        result = response.json().get("results", {}).get("q", {})
+        errors = result.get("errors") or []
+        if errors:
+            raise ValueError(errors[0].get("description", "Graylog terms search failed"))
+
+        pivot = result.get("search_types", {}).get("terms", {})
+        terms = {item["value"]: item["count"] for item in _pivot_counts(pivot)}
+        # A pivot doesn't report what it left out; a full page of values may be cut off
+        other = 0
+        if len(terms) >= size:
+            other = max(1, pivot.get("total", 0) - sum(terms.values()))
+        return {"terms": terms, "other": other}
+
+    def build_sources_index(self, time_range=None, size=None):
+        """
+        Build a SourcesIndex from ``source`` and ``gl2_remote_ip`` terms.
+
+        Args:
+            time_range: Window in seconds (default ``sources_index_range``)
+            size: Maximum terms per field (default ``sources_index_size``)
+
+        Returns:
+            SourcesIndex
+
+        Raises:
+            requests.exceptions.RequestException: on any API failure
+        """
+        time_range = time_range or self.config.get("sources_index_range", 86400)
+        size = size or self.config.get("sources_index_size", 50000)
+
+        sources = self._terms("source", time_range, size)
+        ips = self._terms("gl2_remote_ip", time_range, size)
+        return SourcesIndex(
+            sources["terms"],
+            ips["terms"],
+            time_range=time_range,
+            complete=not sources["other"] and not ips["other"],
+        )
+
+    def get_sources_index(self):
+        """
+        Get the cached sources index without ever building it in the request.
+
+        Once the index is older than ``sources_index_refresh`` a background
+        thread rebuilds it while the previous index keeps being served. A
+        shared cache lock lets only one worker rebuild at a time.
+
+        Returns:
+            SourcesIndex, or None if disabled or not built yet
+        """
+        if not self.api_token or not self.config.get("sources_index", True):
+            return None
+
+        index = cache.get(SOURCES_INDEX_CACHE_KEY)
+        if not isinstance(index, SourcesIndex):
+            index = None
+        if index is None or time.time() - index.built_at >= self.config.get("sources_index_refresh", 300):
+            self._schedule_sources_index_refresh()
+        return index
+
+    def _schedule_sources_index_refresh(self):
+        """Start a background rebuild of the sources index unless another worker holds the lock."""
+        # Two terms requests, each retried on every node at most once
+        lock_timeout = 4 * self.timeout + 30
+        if not cache.add(SOURCES_INDEX_LOCK_KEY, os.getpid(), lock_timeout):
+            return
+        thread = threading.Thread(target=self._refresh_sources_index, name="graylog-sources-index", daemon=True)
+        thread.start()
+
+    def _refresh_sources_index(self):
+        """Build and store the sources index; runs in a thread holding the refresh lock."""
+        try:
+            index = self.build_sources_index()
         except Exception as e:
-            logger.exception(f"Unexpected error querying Graylog: {e}")
-            return {"error": str(e), "messages": []}
+            # The lock is left to expire, which spaces out retries
+            logger.warning(f"Could not build Graylog sources index: {e}")
+            return
+        refresh = self.config.get("sources_index_refresh", 300)
+        cache.set(SOURCES_INDEX_CACHE_KEY, index, refresh * SOURCES_INDEX_MAX_AGE)
+        cache.delete(SOURCES_INDEX_LOCK_KEY)
+        logger.debug(f"Built Graylog sources index with {len(index)} entries")
+
+    def _indexed_query(self, hostname, ip, time_range):
+        """
+        Resolve a host to an exact-match query using the sources index.
+
+        Args:
+            hostname: Name to look up
+            ip: Primary IP address, or None
+            time_range: Requested time range in seconds
+
+        Absence is only trusted from a complete index younger than
+        ``sources_index_absence_age``; an older one can't know sources that
+        started logging since it was built.
+
+        Returns:
+            ``(query, search_type)``, ``(None, "not_indexed")`` if the index proves
+            there are no logs, or None if the index can't decide
+        """
+        if self.config.get("search_field", "source") != "source":
+            return None
+        index = self.get_sources_index()
+        if index is None or not index.covers(time_range):
+            return None
+
+        sources = index.match_host(hostname) if hostname else ()
+        if len(sources) > MAX_INDEXED_SOURCES:
+            return None
+        host_clauses = [f'source:"{source}"' for source in sources]
+        ip_clauses = []
+        if ip and ip in index.ips:
+            ip_clauses.append(f"gl2_remote_ip:{ip}")
+        if ip and ip in index.sources:
+            ip_clauses.append(f'source:"{ip}"')
+
+        clauses = host_clauses + ip_clauses
+        if not clauses:
+            # A truncated or aging index only proves presence, never absence
+            fresh = time.time() - index.built_at <= self.config.get("sources_index_absence_age", 60)
+            return (None, "not_indexed") if index.complete and fresh else None
 
-    def get_logs_for_device(self, device):
+        query = clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"
+        if host_clauses and ip_clauses:
+            search_type = "combined"
+        elif ip_clauses:
+            search_type = "ip"
+        else:
+            search_type = "hostname"
+        return query, search_type
+
+    def _resolve_indexed(self, hostname, ip, fallback_query, time_range):
+        """
+        Resolve a host with the sources index.
+
+        Returns:
+            ``(query, search_type)``, where a ``not_indexed`` search type carries
+            ``fallback_query`` for display, or None if the index can't decide
+        """
+        resolved = self._indexed_query(hostname, ip, time_range)
+        if resolved is None:
+            return None
+        query, search_type = resolved
+        return (fallback_query if query is None else query), search_type
+
+    def execute_query(self, query, search_type, time_range=None, limit=None):
+        """
+        Run a resolved query and tag the result with its search type.
+
+        ``not_indexed`` queries return an empty result without querying Graylog.
+        """
+        time_range = time_range or self.config.get("time_range", 3600)
+        if search_type == "not_indexed":
+            result = {
+                "messages": [],
+                "total_results": 0,
+                "time": 0,
+                "query": query,
+                "time_range": time_range,
+            }
+            result["fingerprint"] = fingerprint_result(result)
+        else:
+            result = self.search_logs(query, time_range=time_range, limit=limit)
+        result["search_type"] = search_type
+        return result
+
+    def _hostname(self, name):
+        """Apply the ``use_fqdn`` setting to an object name."""
+        if not self.config.get("use_fqdn", True) and "." in name:
+            return name.split(".")[0]
+        return name
+
+    def get_logs_for_device(self, device, time_range=None, limit=None):
         """
         Get logs for a NetBox device.
 
         Attempts to find logs by:
-        1. Device name (FQDN or shortname) - case-insensitive regex match
+        1. Device name (FQDN or shortname) - case-insensitive wildcard match
         2. Primary IP address (if fallback enabled)
 
+        When the sources index covers the time range, known sources are
+        matched exactly and devices that never logged return immediately.
+
         For virtual chassis members, uses the chassis name (original hostname)
         instead of the member-specific name (e.g., "switch" instead of "switch.2").
 
         Args:
             device: NetBox Device object
+            time_range: Time range in seconds (default from config)
+            limit: Maximum number of results (default from config)
 
         Returns:
             dict with 'messages' list or 'error' string
         """
-        search_field = self.config.get("search_field", "source")
-        use_fqdn = self.config.get("use_fqdn", True)
-        fallback_to_ip = self.config.get("fallback_to_ip", True)
+        time_range = time_range or self.config.get("time_range", 3600)
+        query, search_type = self.resolve_device_query(device, time_range)
+        result = self.execute_query(query, search_type, time_range=time_range, limit=limit)
+        result["device_name"] = device.name
+        return result
+
+    def resolve_device_query(self, device, time_range=None):
+        """
+        Build the Graylog query for a device without running it.
 
-        # Build search term from device name
-        # Use VC name for virtual chassis members (original hostname)
-        hostname = device.virtual_chassis.name if device.virtual_chassis else device.name
-        if not use_fqdn and "." in hostname:
-            hostname = hostname.split(".")[0]
+        Args:
+            device: NetBox Device object
+            time_range: Time range in seconds (default from config)
+
+        Returns:
+            ``(query, search_type)`` tuple for ``execute_query``
+        """
+        search_field = self.config.get("search_field", "source")
+        time_range = time_range or self.config.get("time_range", 3600)
+        hostname, ip = self.device_host(device)
 
         # Build query - hostname with optional IP fallback using OR
         hostname_query = f"{search_field}:{hostname}*"
 
-        if fallback_to_ip and device.primary_ip4:
-            ip = str(device.primary_ip4.address).split("/")[0]
+        if ip:
             # Combine hostname and IP queries with OR for single search
             query = f"({hostname_query} OR gl2_remote_ip:{ip} OR source:{ip})"
         else:
             query = hostname_query
 
-        result = self.search_logs(query)
-        result["search_type"] = "combined" if " OR " in query else "hostname"
-        result["device_name"] = device.name
+        resolved = self._resolve_indexed(hostname, ip, query, time_range)
+        if resolved is not None:
+            return resolved
+        return query, "combined" if ip else "hostname"
+
+    def resolve_host(self, name, chassis_name=None, address=None):
+        """
+        Apply the hostname and IP matching rules to raw object fields.
+
+        Args:
+            name: Object name
+            chassis_name: Virtual chassis name, used instead of ``name`` for members
+            address: Primary IPv4 address (with or without prefix length)
+
+        Returns:
+            ``(hostname, ip)``; either may be None
+        """
+        name = chassis_name or name
+        hostname = self._hostname(name) if name else None
+        ip = None
+        if address and self.config.get("fallback_to_ip", True):
+            ip = str(address).split("/")[0]
+        return hostname, ip
+
+    def device_host(self, device):
+        """
+        Return the hostname and primary IP (None if unused) logs of a device are matched on.
+
+        For virtual chassis members this is the chassis name (original hostname).
+        """
+        return self.resolve_host(
+            device.name,
+            device.virtual_chassis.name if device.virtual_chassis else None,
+            device.primary_ip4.address if device.primary_ip4 else None,
+        )
+
+    def vm_host(self, vm):
+        """Return the hostname and primary IP (None if unused) logs of a VM are matched on."""
+        return self.resolve_host(vm.name, address=vm.primary_ip4.address if vm.primary_ip4 else None)
+
+    def endpoint_host(self, endpoint):
+        """Return the name (or MAC address if unnamed) logs of an endpoint are matched on."""
+        return (endpoint.name if endpoint.name else str(endpoint.mac_address)), None
+
+    def get_fast_logs(self, hostname, ip=None, time_range=None, limit=None):
+        """
+        Run the fast first stage of a budgeted load.
+
+        Searches only the newest ``fast_log_limit`` messages of the last
+        ``fast_time_range`` seconds with exact-match terms (known sources from
+        the sources index, else the hostname itself in ``search_field``),
+        which Graylog answers without scanning wildcard term ranges.
+
+        Args:
+            hostname: Hostname logs are matched on
+            ip: Primary IP address, or None
+            time_range: Requested time range in seconds (default from config)
+            limit: Requested number of messages (default from config)
+
+        Returns:
+            dict with 'messages' list or 'error' string
+        """
+        time_range = min(time_range or self.config.get("time_range", 3600), self.config.get("fast_time_range", 900))
+        limit = min(limit or self.config.get("log_limit", 50), self.config.get("fast_log_limit", 20))
+
+        resolved = self._indexed_query(hostname, ip, time_range)
+        if resolved is None or resolved[0] is None:
+            clauses = [f'{self.config.get("search_field", "source")}:"{hostname}"']
+            if ip:
+                clauses.append(f"gl2_remote_ip:{ip}")
+            query = clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"
+            search_type = resolved[1] if resolved else ("combined" if ip else "hostname")
+            resolved = (query, search_type)
+        return self.execute_query(*resolved, time_range=time_range, limit=limit)
+
+    def get_logs_for_interface(self, interface, time_range=None):
+        """
+        Get the logs of a device that mention one of its interfaces.
+
+        The parent device's logs are fetched once (``interface_log_limit``
+        messages, through the same query and cache as the device tab) and
+        indexed by interface in one pass. The index is cached per device and
+        result fingerprint, so every interface tab of the device is served
+        from it without another search.
+
+        Args:
+            interface: NetBox Interface object
+            time_range: Time range in seconds (default from config)
+
+        Returns:
+            dict with 'messages' list or 'error' string
+        """
+        device = interface.device
+        limit = self.config.get("interface_log_limit", 500)
+        result = self.get_logs_for_device(device, time_range=time_range, limit=limit)
+        if result.get("error"):
+            return result
+
+        names = sorted(device.interfaces.values_list("name", flat=True))
+        names_digest = hashlib.blake2b("\n".join(names).encode(), digest_size=8).hexdigest()
+        cache_key = f"graylog_interface_index_{device.pk}_{result['fingerprint']}_{names_digest}"
+        positions = cache.get(cache_key)
+        if positions is None:
+            positions = index_messages(result["messages"], build_interface_index(names))
+            cache.set(cache_key, positions, self.cache_timeout)
+
+        messages = [result["messages"][position] for position in positions.get(interface.name, ())]
+        interface_result = {
+            **result,
+            "messages": messages,
+            "total_results": len(messages),
+            "next_cursor": None,
+            "facets": count_facets(messages, FACET_FIELDS),
+            "interface": interface.name,
+            "scanned": len(result["messages"]),
+        }
+        interface_result["fingerprint"] = fingerprint_result(interface_result)
+        return interface_result
+
+    def get_correlated_logs(self, device, neighbors, time_range=None, limit=None):
+        """
+        Get one merged timeline for a device and its neighbors.
+
+        All queries are resolved up front, run concurrently and k-way merged
+        newest first. Each message is tagged with its ``device``.
+
+        Args:
+            device: NetBox Device object
+            neighbors: Neighboring Device objects
+            time_range: Time range in seconds (default from config)
+            limit: Maximum number of merged messages (default from config)
+
+        Returns:
+            dict with merged 'messages', per-device 'devices' and 'warnings'
+        """
+        time_range = time_range or self.config.get("time_range", 3600)
+        limit = limit or self.config.get("log_limit", 50)
+
+        # Resolve every query before any search runs; skip devices sharing a
+        # query (e.g. virtual chassis members) so no message appears twice
+        targets = []
+        seen_queries = set()
+        for obj in [device, *neighbors]:
+            query, search_type = self.resolve_device_query(obj, time_range)
+            if query in seen_queries:
+                continue
+            seen_queries.add(query)
+            targets.append((obj, query, search_type))
+
+        # Worker threads share the caller's latency budget
+        when = getattr(_deadline, "at", None)
+
+        def run(target):
+            with deadline_at(when):
+                return self.execute_query(target[1], target[2], time_range=time_range, limit=limit)
+
+        results = list(get_executor().map(run, targets))
+
+        streams = []
+        devices = []
+        warnings = []
+        for (obj, query, search_type), result in zip(targets, results):
+            if result.get("error"):
+                warnings.append(f"{obj.name}: {result['error']}")
+                continue
+            devices.append({"name": obj.name, "search_type": search_type, "total": result.get("total_results", 0)})
+            streams.append([{**log, "device": obj.name} for log in result.get("messages", [])])
+
+        result = {
+            "messages": merge_timelines(streams, limit),
+            "total_results": sum(item["total"] for item in devices),
+            "time": max((item.get("time", 0) for item in results), default=0),
+            "query": " | ".join(query for _, query, _ in targets),
+            "time_range": time_range,
+            "search_type": "correlated",
+            "devices": devices,
+            "warnings": warnings,
+        }
+        if warnings and not devices:
+            result["error"] = "; ".join(warnings)
+        result["fingerprint"] = fingerprint_result(result)
         return result
 
-    def get_logs_for_vm(self, vm):
+    def get_logs_for_vm(self, vm, time_range=None, limit=None):
         """
         Get logs for a NetBox VirtualMachine.
 
         Args:
             vm: NetBox VirtualMachine object
+            time_range: Time range in seconds (default from config)
+            limit: Maximum number of results (default from config)
 
         Returns:
             dict with 'messages' list or 'error' string
         """
         search_field = self.config.get("search_field", "source")
-        use_fqdn = self.config.get("use_fqdn", True)
-        fallback_to_ip = self.config.get("fallback_to_ip", True)
+        time_range = time_range or self.config.get("time_range", 3600)
 
         # Build search term from VM name
-        hostname = vm.name
-        if not use_fqdn and "." in hostname:
-            hostname = hostname.split(".")[0]
+        hostname, ip = self.vm_host(vm)
 
         # Try hostname first - use wildcard for matching (Graylog wildcards are case-insensitive)
         # Append * to match FQDN variations (e.g., switch01 matches switch01.example.com)
         query = f"{search_field}:{hostname}*"
-        result = self.search_logs(query)
+
+        # The sources index resolves hostname and IP in one exact search
+        resolved = self._resolve_indexed(hostname, ip, query, time_range)
+        if resolved is not None:
+            result = self.execute_query(*resolved, time_range=time_range, limit=limit)
+            result["vm_name"] = vm.name
+            return result
+
+        result = self.search_logs(query, time_range=time_range, limit=limit)
 
         # If no results and fallback enabled, try primary IP
-        if fallback_to_ip and not result.get("messages") and not result.get("error") and vm.primary_ip4:
-            ip = str(vm.primary_ip4.address).split("/")[0]
+        if ip and not result.get("messages") and not result.get("error"):
             query = f"gl2_remote_ip:{ip}"
-            result = self.search_logs(query)
+            result = self.search_logs(query, time_range=time_range, limit=limit)
             if result.get("messages"):
                 result["search_type"] = "ip"
             else:
                 query = f"source:{ip}"
-                result = self.search_logs(query)
+                result = self.search_logs(query, time_range=time_range, limit=limit)
                 if result.get("messages"):
                     result["search_type"] = "source_ip"
         else:
@@ -206,6 +1091,30 @@ class GraylogClient:
         result["vm_name"] = vm.name
         return result
 
+    def get_logs_for_endpoint(self, endpoint, time_range=None, limit=None):
+        """
+        Get logs for a netbox_endpoints Endpoint.
+
+        Endpoints are matched by name, or by MAC address if unnamed.
+
+        Args:
+            endpoint: Endpoint object
+            time_range: Time range in seconds (default from config)
+            limit: Maximum number of results (default from config)
+
+        Returns:
+            dict with 'messages' list or 'error' string
+        """
+        time_range = time_range or self.config.get("time_range", 3600)
+        search_term, _ = self.endpoint_host(endpoint)
+        query = f"source:{search_term}*"
+
+        query, search_type = self._resolve_indexed(search_term, None, query, time_range) or (query, "name")
+        # Endpoints only ever match by name
+        if search_type != "not_indexed":
+            search_type = "name"
+        return self.execute_query(query, search_type, time_range=time_range, limit=limit)
+
     def get_log_summary(self, time_range=3600, cache_timeout=120):
         """Get aggregate log volume and error/warning counts.
 
@@ -213,8 +1122,14 @@ class GraylogClient:
             time_range: Time window in seconds
             cache_timeout: Cache duration in seconds
 
+        If Graylog can't answer (unreachable, or the latency budget ran out),
+        the last good summary is returned flagged ``stale``. When the budget ran
+        out, the summary is also fetched again in a background thread without a
+        budget and cached for the next render; ``{pending}`` is returned if there
+        is no last summary yet.
+
         Returns:
-            dict with {total, errors, warnings, cached} or {error}
+            dict with {total, errors, warnings, cached, fetched_at}, {pending} or {error}
         """
         cache_key = f"graylog_log_summary_{time_range}"
         cached = cache.get(cache_key)
@@ -225,26 +1140,215 @@ class GraylogClient:
         # Get total count
         total_result = self.search_logs("*", time_range=time_range, limit=1)
         if total_result.get("error"):
-            return {"error": total_result["error"]}
+            return self._summary_fallback(total_result, time_range, cache_timeout)
 
-        # Get error count (syslog level 3)
-        error_result = self.search_logs("level:3", time_range=time_range, limit=1)
-        # Get warning count (syslog level 4)
-        warning_result = self.search_logs("level:4", time_range=time_range, limit=1)
+        levels = (total_result.get("facets") or {}).get("levels")
+        if levels is not None:
+            # The Views API returned per-level counts with the total
+            counts = {item["value"]: item["count"] for item in levels}
+            errors = counts.get("3", 0)
+            warnings = counts.get("4", 0)
+        else:
+            # Get error count (syslog level 3)
+            error_result = self.search_logs("level:3", time_range=time_range, limit=1)
+            # Get warning count (syslog level 4)
+            warning_result = self.search_logs("level:4", time_range=time_range, limit=1)
+            failed = error_result if error_result.get("error") else warning_result
+            if failed.get("error"):
+                return self._summary_fallback(failed, time_range, cache_timeout)
+            errors = error_result.get("total_results", 0)
+            warnings = warning_result.get("total_results", 0)
 
         summary = {
             "total": total_result.get("total_results", 0),
-            "errors": error_result.get("total_results", 0),
-            "warnings": warning_result.get("total_results", 0),
+            "errors": errors,
+            "warnings": warnings,
             "cached": False,
+            "fetched_at": time.time(),
         }
         cache.set(cache_key, summary, cache_timeout)
+        cache.set(f"graylog_log_summary_last_{time_range}", summary, LAST_SUMMARY_TIMEOUT)
         return summary
 
+    def _summary_fallback(self, failed, time_range, cache_timeout):
+        """
+        Answer for a summary search that failed.
+
+        Args:
+            failed: Error result of the failed search
+            time_range: Time window in seconds
+            cache_timeout: Cache duration in seconds
+
+        Returns:
+            The last good summary flagged ``stale``, ``{pending}`` while a
+            background fetch runs, or ``{error}``
+        """
+        last = self._last_summary(time_range)
+        if failed.get("budget_exhausted"):
+            # Graylog may simply be slower than the budget; never retrying
+            # without it would leave nothing to cache or fall back to
+            self._schedule_summary_refresh(time_range, cache_timeout)
+            return last or {"pending": True, "cached": False}
+        return last or {"error": failed["error"]}
+
+    def _schedule_summary_refresh(self, time_range, cache_timeout):
+        """Fetch the summary in a background thread unless another worker already is."""
+        lock_key = f"graylog_log_summary_lock_{time_range}"
+        # Three searches, each retried on every node at most once
+        if not cache.add(lock_key, os.getpid(), 6 * self.timeout + 30):
+            return
+        thread = threading.Thread(
+            target=self._refresh_log_summary,
+            args=(time_range, cache_timeout, lock_key),
+            name="graylog-log-summary",
+            daemon=True,
+        )
+        thread.start()
+
+    def _refresh_log_summary(self, time_range, cache_timeout, lock_key):
+        """Fetch and cache the summary; runs in a thread with no latency budget."""
+        summary = self.get_log_summary(time_range=time_range, cache_timeout=cache_timeout)
+        if "error" in summary or summary.get("stale"):
+            # The lock is left to expire, which spaces out retries
+            logger.warning(f"Could not refresh Graylog log summary for {time_range}s")
+            return
+        cache.delete(lock_key)
+
+    def _last_summary(self, time_range):
+        """Return the last good summary for ``time_range`` flagged ``stale``, or None."""
+        last = cache.get(f"graylog_log_summary_last_{time_range}")
+        if last is None:
+            return None
+        return {**last, "cached": True, "stale": True}
+
+
+def normalize_message(log, preview_length=None):
+    """
+    Normalize a raw Graylog search message for rendering.
+
+    Copies ``_id`` to ``message_id`` because Django templates can't access
+    underscore-prefixed attributes, drops ``full_message`` and cuts
+    ``message`` to ``preview_length`` characters (flagged as ``truncated``).
+    A cut message keeps the interface keys of its full text in
+    ``interface_keys`` for the interface tab. Done once per search so cached
+    results are already in template shape.
+
+    Args:
+        log: ``{"index": ..., "message": {...}}`` dict from Graylog
+        preview_length: Maximum message length to keep (None keeps everything)
+
+    Returns:
+        Normalized message dict
+    """
+    message = {key: value for key, value in log.get("message", {}).items() if key != "full_message"}
+    message["message_id"] = message.get("_id", "")
+    text = message.get("message")
+    if preview_length and isinstance(text, str) and len(text) > preview_length:
+        message["message"] = text[:preview_length]
+        message["truncated"] = True
+        message["interface_keys"] = mentioned_keys(text)
+    return {"index": log.get("index", ""), "message": message}
+
+
+def _logs_cache_key(query, time_range, limit, fields):
+    """Cache key of a first-page search result."""
+    cache_key = f"graylog_logs_{query}_{time_range}_{limit}"
+    if fields != LIST_FIELDS:
+        cache_key += f"_{','.join(fields)}"
+    return cache_key
+
+
+def _pivot_search_type(search_type_id, field, size):
+    """Views API pivot search type counting the top ``size`` values of ``field``."""
+    return {
+        "id": search_type_id,
+        "type": "pivot",
+        "row_groups": [{"type": "values", "fields": [field], "limit": size}],
+        "series": [{"id": "count()", "type": "count"}],
+        "rollup": True,
+    }
+
+
+def _pivot_counts(pivot):
+    """
+    Extract ``(value, count)`` pairs from a single-field pivot result.
+
+    Args:
+        pivot: Pivot search type result from the Views API
+
+    Returns:
+        List of ``{"value": ..., "count": ...}`` dicts, largest count first
+    """
+    counts = []
+    for row in pivot.get("rows", []):
+        if row.get("source") != "leaf" or not row.get("key"):
+            continue
+        count = next((value.get("value", 0) for value in row.get("values", [])), 0)
+        counts.append({"value": str(row["key"][0]), "count": count})
+    counts.sort(key=lambda item: item["count"], reverse=True)
+    return counts
+
+
+def _already_seen(log, cursor):
+    """Whether a message from an absolute page search was shown on an earlier page."""
+    message = log["message"]
+    # Graylog timestamps share one fixed-width UTC format, so they compare as strings
+    timestamp = message.get("timestamp") or ""
+    return timestamp > cursor["to"] or (timestamp == cursor["to"] and message["message_id"] in cursor["seen_ids"])
+
+
+def _next_cursor(query, time_range, start, messages, cursor=None):
+    """Build the cursor following the last message of a page (newest first)."""
+    last_timestamp = messages[-1]["message"].get("timestamp")
+    seen_ids = {log["message"]["message_id"] for log in messages if log["message"].get("timestamp") == last_timestamp}
+    # A page made entirely of one timestamp must keep skipping what earlier pages showed
+    if cursor and cursor["to"] == last_timestamp:
+        seen_ids |= cursor["seen_ids"]
+    return encode_cursor(query, time_range, start, last_timestamp, seen_ids)
+
+
+def fingerprint_result(result):
+    """
+    Compute a stable fingerprint of a normalized search result.
+
+    Graylog messages are immutable once indexed, so the index/id/timestamp of
+    each row plus the query metadata identify the result without hashing
+    message bodies.
+
+    Args:
+        result: Normalized result dict as returned by ``search_logs``
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{result.get('query')}|{result.get('time_range')}|{result.get('total_results')}".encode())
+    for log in result.get("messages", []):
+        message = log.get("message", {})
+        digest.update(f"|{log.get('index')}/{message.get('message_id')}/{message.get('timestamp')}".encode())
+    return digest.hexdigest()
+
 
 # Singleton instance
 _client = None
 
+# Shared worker threads for concurrent searches, reused so per-thread cache
+# connections are too; recreated after a fork
+_executor = None
+_executor_pid = None
+
+
+def get_executor():
+    """Get or create the thread pool used for concurrent Graylog searches."""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = settings.PLUGINS_CONFIG.get("netbox_graylog", {}).get("max_concurrent_searches", 8)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="graylog-search")
+        _executor_pid = os.getpid()
+    return _executor
+
 
 def get_client():
     """Get or create the Graylog client singleton."""
@@ -0,0 +1,114 @@
+"""
+Interface name matching for NetBox Graylog Plugin.
+
+Network devices rarely log an interface under its NetBox name: the same port
+shows up as ``GigabitEthernet1/0/1``, ``Gi1/0/1`` or ``Gig 1/0/1`` depending on
+the platform and message. One precompiled pattern finds interface-like tokens
+in a message, and each token is reduced to a canonical key (full type name plus
+the lowercase port number) that is looked up in a dict built from the device's
+NetBox interface names. Indexing a result is one pass over its messages
+regardless of how many interfaces the device has.
+"""
+
+import re
+
+# Canonical (full, lowercase) interface type -> abbreviations seen in logs
+INTERFACE_ABBREVIATIONS = {
+    "gigabitethernet": ("gi", "gig", "gige"),
+    "tengigabitethernet": ("te", "ten", "tengig", "tengige"),
+    "twentyfivegige": ("twe", "twentyfivegigabitethernet"),
+    "fortygigabitethernet": ("fo", "for", "fortygige"),
+    "hundredgige": ("hu", "hundredgigabitethernet"),
+    "fourhundredgige": ("fh",),
+    "twogigabitethernet": ("tw", "twogige"),
+    "fivegigabitethernet": ("fi", "fivegige"),
+    "appgigabitethernet": ("ap",),
+    "fastethernet": ("fa", "fas"),
+    "ethernet": ("eth", "et"),
+    "port-channel": ("po", "portchannel"),
+    "bundle-ether": ("be",),
+    "vlan": ("vl",),
+    "loopback": ("lo", "lp"),
+    "tunnel": ("tu",),
+    "management": ("mgmt", "ma"),
+    "serial": ("se",),
+}
+
+# Any spelling -> canonical type
+CANONICAL_TYPES = {
+    spelling: canonical
+    for canonical, abbreviations in INTERFACE_ABBREVIATIONS.items()
+    for spelling in (canonical, *abbreviations)
+}
+
+# A type name followed by a port number: ``Gi1/0/1``, ``Ethernet 1/1``,
+# ``Po10``, ``xe-0/0/1``, ``Gi1/0/1.100``. Neighbouring word characters,
+# slashes and further port digits are excluded so ``Gi1/0/1`` never matches inside
+# ``Gi1/0/10`` and ``Ethernet1/1`` never matches inside ``GigabitEthernet1/1``.
+INTERFACE_PATTERN = re.compile(
+    r"(?<![\w-])([a-z][a-z-]*?)[ ]?(\d+(?:[/:]\d+)*(?:\.\d+)?)(?![\w/]|[.:]\d)",
+    re.IGNORECASE,
+)
+
+
+def interface_key(type_name, number):
+    """Canonical lookup key for an interface type and port number."""
+    type_name = type_name.lower()
+    return CANONICAL_TYPES.get(type_name, type_name), number
+
+
+def mentioned_keys(text):
+    """Canonical keys of every interface-like token in ``text``, in order, without repeats."""
+    return tuple(dict.fromkeys(interface_key(*match.groups()) for match in INTERFACE_PATTERN.finditer(text)))
+
+
+def build_interface_index(names):
+    """
+    Build the lookup table for a device's interfaces.
+
+    Args:
+        names: NetBox interface names of one device
+
+    Returns:
+        dict of canonical key -> interface name
+    """
+    index = {}
+    for name in names:
+        match = INTERFACE_PATTERN.fullmatch(name)
+        if match:
+            index.setdefault(interface_key(*match.groups()), name)
+    return index
+
+
+def index_messages(messages, interfaces):
+    """
+    Map each interface to the messages that mention it.
+
+    Messages cut to a preview carry the keys of their full text in
+    ``interface_keys`` (see ``normalize_message``), so mentions past the
+    preview are found too.
+
+    Args:
+        messages: Normalized messages, newest first
+        interfaces: Lookup table from ``build_interface_index``
+
+    Returns:
+        dict of interface name -> tuple of message positions, newest first
+    """
+    positions = {}
+    if not interfaces:
+        return positions
+    for position, log in enumerate(messages):
+        keys = log["message"].get("interface_keys")
+        if keys is None:
+            text = log["message"].get("message")
+            if not isinstance(text, str):
+                continue
+            keys = mentioned_keys(text)
+        mentioned = set()
+        for key in keys:
+            name = interfaces.get(key)
+            if name is not None and name not in mentioned:
+                mentioned.add(name)
+                positions.setdefault(name, []).append(position)
+    return {name: tuple(found) for name, found in positions.items()}
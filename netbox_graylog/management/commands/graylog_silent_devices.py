@@ -0,0 +1,139 @@
+"""
+List (and optionally tag) active devices and VMs that have stopped logging.
+
+Graylog is asked once per field for every ``source`` and ``gl2_remote_ip``
+value seen in the window (terms aggregations), and the whole inventory is
+matched against those sets with the same hostname, virtual chassis and IP
+rules the log tabs use. The cost is two Graylog requests and two database
+queries regardless of inventory size.
+"""
+
+import json
+import time
+
+from dcim.models import Device
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from extras.models import Tag, TaggedItem
+from virtualization.models import VirtualMachine
+
+from ...graylog_client import get_client
+
+
+class Command(BaseCommand):
+    help = "Report active devices and virtual machines with no Graylog messages in a time window"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--range",
+            type=int,
+            default=86400,
+            help="Window in seconds an object must have logged in (default 86400)",
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=None,
+            help="Maximum sources/IPs fetched per field (default sources_index_size)",
+        )
+        parser.add_argument(
+            "--tag",
+            help="Slug of a tag to set on silent objects and remove from objects that log again",
+        )
+        parser.add_argument("--no-vms", action="store_true", help="Only check devices")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        client = get_client()
+        if not client.api_token:
+            raise CommandError("Graylog API token not configured")
+        search_field = client.config.get("search_field", "source")
+        if search_field != "source":
+            # The index holds ``source`` values; matching them against names the
+            # tabs look up in another field would report the wrong objects
+            raise CommandError(f"search_field is {search_field!r}; silent device detection only supports 'source'")
+
+        size = options["size"] or client.config.get("sources_index_size", 50000)
+        try:
+            index = client.build_sources_index(time_range=options["range"], size=size)
+        except Exception as e:
+            raise CommandError(f"Could not fetch sources from Graylog: {e}")
+        if not index.complete:
+            # A truncated terms list only proves presence, never absence
+            raise CommandError(f"Graylog has more than {size} sources or IPs; raise --size to get a complete list")
+
+        silent = {Device: self.find_silent(client, index, Device)}
+        if not options["no_vms"]:
+            silent[VirtualMachine] = self.find_silent(client, index, VirtualMachine)
+
+        if options["tag"]:
+            self.apply_tag(options["tag"], silent)
+
+        elapsed = time.monotonic() - started
+        if options["json"]:
+            report = {
+                "time_range": options["range"],
+                "sources": len(index.sources),
+                "ips": len(index.ips),
+                "elapsed": round(elapsed, 3),
+                "silent": {
+                    model._meta.model_name: [{"id": pk, "name": name} for pk, name in objects]
+                    for model, objects in silent.items()
+                },
+            }
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for model, objects in silent.items():
+            for pk, name in objects:
+                self.stdout.write(f"{model._meta.model_name}\t{pk}\t{name}")
+        counts = ", ".join(f"{len(objects)} {model._meta.verbose_name_plural}" for model, objects in silent.items())
+        self.stderr.write(
+            f"Silent for {options['range']}s: {counts} "
+            f"({len(index.sources)} sources, {len(index.ips)} IPs, {elapsed:.1f}s)"
+        )
+
+    def find_silent(self, client, index, model):
+        """
+        Return ``(pk, name)`` of active objects of ``model`` unknown to the index.
+
+        Only the fields the matching rules need are loaded, in one query.
+        """
+        fields = ["pk", "name", "primary_ip4__address"]
+        if model is Device:
+            fields.append("virtual_chassis__name")
+        silent = []
+        for row in model.objects.filter(status="active").values_list(*fields).iterator(chunk_size=5000):
+            pk, name, address = row[:3]
+            hostname, ip = client.resolve_host(name, row[3] if len(row) > 3 else None, address)
+            if not hostname and not ip:
+                continue  # Unnamed and unaddressed; nothing to match on
+            if not index.has_logs(hostname, ip):
+                silent.append((pk, name))
+        return silent
+
+    def apply_tag(self, slug, silent):
+        """
+        Set ``slug`` on silent objects and remove it from the others.
+
+        Only objects whose tag changes are touched, through ``obj.tags`` so
+        NetBox's m2m signals fire. Without a request there is no change log
+        entry for them.
+        """
+        tag, _ = Tag.objects.get_or_create(slug=slug, defaults={"name": slug})
+        for model, objects in silent.items():
+            content_type = ContentType.objects.get_for_model(model)
+            current = set(
+                TaggedItem.objects.filter(tag=tag, content_type=content_type).values_list("object_id", flat=True)
+            )
+            wanted = {pk for pk, _ in objects}
+
+            for obj in model.objects.filter(pk__in=current - wanted):
+                obj.tags.remove(tag)
+            for obj in model.objects.filter(pk__in=wanted - current):
+                obj.tags.add(tag)
+            self.stderr.write(
+                f"Tag {slug!r} on {model._meta.verbose_name_plural}: "
+                f"{len(wanted - current)} added, {len(current - wanted)} removed"
+            )
@@ -0,0 +1,140 @@
+"""
+Report the plugin's contribution to NetBox startup time.
+
+Runs ``manage.py check`` in a subprocess with ``python -X importtime``,
+attributes every import made on behalf of a ``netbox_graylog`` module to the
+plugin, and adds the time this process spent in ``GraylogConfig.ready()``.
+Exits with an error when the total exceeds the budget, so it can run in CI.
+"""
+
+import os
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PLUGIN_PACKAGE = "netbox_graylog"
+
+# Default startup budget in milliseconds (imports plus ready())
+DEFAULT_BUDGET_MS = 50
+
+
+def parse_importtime(output):
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        output: stderr of a ``python -X importtime`` run
+
+    Returns:
+        List of ``(self_us, cumulative_us, depth, module)`` tuples in the
+        order Python printed them (children before their parent)
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((self_us, cumulative_us, depth, name.strip()))
+    return entries
+
+
+def plugin_import_cost(entries):
+    """
+    Attribute import time to the plugin.
+
+    A plugin module's cumulative time covers everything first imported
+    beneath it (``requests``, ``rest_framework`` submodules, ...). Only the
+    outermost plugin modules are summed so nested ones aren't counted twice.
+
+    Args:
+        entries: Output of ``parse_importtime``
+
+    Returns:
+        Tuple of (total microseconds, plugin module entries, heaviest
+        third-party entries imported beneath plugin modules)
+    """
+    total = 0
+    modules = []
+    dependencies = []
+    subtree_depth = None
+    # Reversed, the output is in pre-order: each parent before its children
+    for entry in reversed(entries):
+        self_us, cumulative_us, depth, name = entry
+        if subtree_depth is not None and depth <= subtree_depth:
+            subtree_depth = None
+        is_plugin = name.split(".", 1)[0] == PLUGIN_PACKAGE
+        if is_plugin:
+            modules.append(entry)
+        if subtree_depth is not None:
+            if not is_plugin:
+                dependencies.append(entry)
+            continue
+        if is_plugin:
+            total += cumulative_us
+            subtree_depth = depth
+    dependencies.sort(key=lambda entry: entry[0], reverse=True)
+    return total, modules, dependencies
+
+
+class Command(BaseCommand):
+    help = "Measure how much the Graylog plugin adds to NetBox startup time"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=DEFAULT_BUDGET_MS,
+            help=f"Fail if imports plus ready() exceed this many milliseconds (default {DEFAULT_BUDGET_MS})",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of heaviest dependency imports to list (default 10)",
+        )
+
+    def handle(self, *args, **options):
+        manage_py = sys.argv[0] if os.path.basename(sys.argv[0]) == "manage.py" else None
+        if manage_py is None:
+            manage_py = os.path.join(settings.BASE_DIR, "manage.py")
+        if not os.path.exists(manage_py):
+            raise CommandError(f"Cannot find manage.py (looked for {manage_py})")
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", manage_py, "check"],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        if result.returncode != 0:
+            raise CommandError(f"manage.py check failed:\n{result.stdout}{result.stderr[-2000:]}")
+
+        total_us, modules, dependencies = plugin_import_cost(parse_importtime(result.stderr))
+        ready_duration = apps.get_app_config(PLUGIN_PACKAGE).ready_duration or 0
+        total_ms = total_us / 1000 + ready_duration * 1000
+
+        self.stdout.write("Plugin modules (self / cumulative ms):")
+        for self_us, cumulative_us, _depth, name in sorted(modules, key=lambda entry: entry[3]):
+            self.stdout.write(f"  {name:<45} {self_us / 1000:8.1f} {cumulative_us / 1000:8.1f}")
+        if dependencies:
+            self.stdout.write("Heaviest imports pulled in by the plugin (self ms):")
+            for self_us, _cumulative_us, _depth, name in dependencies[: options["top"]]:
+                self.stdout.write(f"  {name:<45} {self_us / 1000:8.1f}")
+
+        self.stdout.write(f"Imports: {total_us / 1000:.1f} ms")
+        self.stdout.write(f"ready(): {ready_duration * 1000:.1f} ms")
+        summary = f"Total: {total_ms:.1f} ms (budget {options['budget']:.0f} ms)"
+        if total_ms > options["budget"]:
+            raise CommandError(f"Over startup budget. {summary}")
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,172 @@
+"""
+Graylog API node pool
+
+Spreads API requests across several Graylog nodes, preferring healthy nodes
+with the fewest in-flight requests and the lowest observed latency. A
+background thread polls each node's load balancer status endpoint so dead
+nodes are skipped before a request has to time out against them.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the exponentially weighted latency average
+LATENCY_SMOOTHING = 0.3
+
+
+def parse_node_urls(value):
+    """
+    Parse the ``graylog_url`` setting into a list of base URLs.
+
+    Accepts a single URL, a comma-separated string or a list/tuple of URLs.
+
+    Args:
+        value: Raw setting value
+
+    Returns:
+        List of base URLs without trailing slashes
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    return [url.strip().rstrip("/") for url in value or [] if url and url.strip()]
+
+
+class GraylogNode:
+    """Runtime state for a single Graylog API node."""
+
+    __slots__ = ("url", "healthy", "in_flight", "latency", "failures")
+
+    def __init__(self, url):
+        self.url = url
+        self.healthy = True
+        self.in_flight = 0
+        self.latency = 0.0
+        self.failures = 0
+
+    def __repr__(self):
+        state = "healthy" if self.healthy else "down"
+        return f"<GraylogNode {self.url} {state} in_flight={self.in_flight} latency={self.latency:.3f}s>"
+
+
+class NodePool:
+    """Health-checked pool of Graylog API nodes with least-loaded selection."""
+
+    def __init__(self, urls, health_check_interval=30, timeout=5):
+        """
+        Initialize the pool.
+
+        Args:
+            urls: List of node base URLs
+            health_check_interval: Seconds between background health checks (0 disables)
+            timeout: Timeout in seconds for each health check request
+        """
+        self.nodes = [GraylogNode(url) for url in urls]
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+
+    @property
+    def urls(self):
+        return [node.url for node in self.nodes]
+
+    def acquire(self, exclude=()):
+        """
+        Pick the best node for a request and mark it in-flight.
+
+        Healthy nodes are preferred; if every node is marked down, all nodes
+        are candidates again so a recovered cluster is noticed immediately.
+
+        Args:
+            exclude: URLs already tried for this request
+
+        Returns:
+            GraylogNode, or None if every node has been excluded
+        """
+        self._ensure_health_thread()
+        with self._lock:
+            candidates = [node for node in self.nodes if node.url not in exclude]
+            if not candidates:
+                return None
+            healthy = [node for node in candidates if node.healthy]
+            node = min(healthy or candidates, key=lambda n: (n.in_flight, n.latency))
+            node.in_flight += 1
+            return node
+
+    def release(self, node, elapsed=None, failed=False):
+        """
+        Return a node after a request and record the outcome.
+
+        Args:
+            node: Node returned by ``acquire``
+            elapsed: Request duration in seconds (successful requests only)
+            failed: True if the node timed out, refused or returned a gateway error
+        """
+        with self._lock:
+            node.in_flight = max(node.in_flight - 1, 0)
+            if failed:
+                node.failures += 1
+                node.healthy = False
+                logger.warning(f"Graylog node {node.url} failed, marking down")
+            else:
+                node.failures = 0
+                node.healthy = True
+                if elapsed is not None and node.latency:
+                    node.latency = LATENCY_SMOOTHING * elapsed + (1 - LATENCY_SMOOTHING) * node.latency
+                elif elapsed is not None:
+                    node.latency = elapsed
+
+    def check_node(self, node):
+        """
+        Probe a node's load balancer status endpoint.
+
+        Graylog answers ``/api/system/lbstatus`` with 200 ``ALIVE`` when the
+        node accepts traffic and 503 when it is dead or throttled.
+        """
+        import requests
+
+        started = time.monotonic()
+        try:
+            response = requests.get(f"{node.url}/api/system/lbstatus", timeout=self.timeout, verify=False)
+            alive = response.status_code == 200
+        except requests.exceptions.RequestException:
+            alive = False
+
+        if alive != node.healthy:
+            logger.info(f"Graylog node {node.url} is now {'healthy' if alive else 'down'}")
+        with self._lock:
+            node.healthy = alive
+            if alive and not node.latency:
+                node.latency = time.monotonic() - started
+
+    def check_all(self):
+        """Run a health check against every node."""
+        for node in self.nodes:
+            self.check_node(node)
+
+    def _ensure_health_thread(self):
+        """Start the background health checker once per process (workers fork after import)."""
+        if len(self.nodes) < 2 or not self.health_check_interval:
+            return
+        pid = os.getpid()
+        if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+                return
+            self._thread_pid = pid
+            self._thread = threading.Thread(target=self._health_loop, name="graylog-health-check", daemon=True)
+            self._thread.start()
+
+    def _health_loop(self):
+        while True:
+            try:
+                self.check_all()
+            except Exception as e:
+                logger.exception(f"Graylog health check failed: {e}")
+            time.sleep(self.health_check_interval)
@@ -0,0 +1,145 @@
+"""
+Result post-processing for NetBox Graylog Plugin.
+
+Stages here take normalized messages (newest first) and return new lists
+without mutating their input, which may be shared with the cache.
+"""
+
+import heapq
+import re
+from collections import Counter
+from itertools import islice
+
+# Parts of a message that differ between otherwise identical events
+VOLATILE_PATTERN = re.compile(
+    r"""
+    \d{4}-\d{2}-\d{2}[T\ ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?  # ISO 8601 timestamps
+    | \b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}(?:\.\d+)?  # syslog timestamps
+    | \b0x[0-9a-fA-F]+\b  # hex counters and addresses
+    | (?<![\w/.:-])\d+(?:\.\d+)?(?![\w/:]|\.\d)  # standalone numbers: counters, PIDs, durations
+    """,
+    re.VERBOSE,
+)
+
+
+# Syslog severity levels: level -> (label, badge class)
+SEVERITY_LEVELS = {
+    "0": ("Emergency", "text-bg-danger"),
+    "1": ("Alert", "text-bg-danger"),
+    "2": ("Critical", "text-bg-danger"),
+    "3": ("Error", "text-bg-danger"),
+    "4": ("Warning", "text-bg-warning"),
+    "5": ("Notice", "text-bg-info"),
+    "6": ("Info", "text-bg-secondary"),
+    "7": ("Debug", "text-bg-light"),
+}
+
+
+def severity_facets(levels):
+    """
+    Label per-level counts for display, most severe first.
+
+    Args:
+        levels: List of ``{"value": level, "count": n}`` dicts
+
+    Returns:
+        List of ``{"level", "label", "css", "count"}`` dicts
+    """
+    facets = []
+    for item in levels or []:
+        label, css = SEVERITY_LEVELS.get(item["value"], (f"Level {item['value']}", "text-bg-secondary"))
+        facets.append({"level": item["value"], "label": label, "css": css, "count": item["count"]})
+    facets.sort(key=lambda facet: facet["level"])
+    return facets
+
+
+def count_facets(messages, facet_fields):
+    """
+    Count facet values over a list of messages.
+
+    Produces the same shape as the facets Graylog returns, for results that
+    are derived locally from a larger cached result.
+
+    Args:
+        messages: Normalized messages
+        facet_fields: Mapping of facet name -> (field, number of values)
+
+    Returns:
+        dict of facet name -> list of ``{"value": ..., "count": ...}`` dicts,
+        largest count first
+    """
+    facets = {}
+    for facet, (field, size) in facet_fields.items():
+        counts = Counter(str(log["message"][field]) for log in messages if log["message"].get(field) not in (None, ""))
+        facets[facet] = [{"value": value, "count": count} for value, count in counts.most_common(size)]
+    return facets
+
+
+def message_fingerprint(message):
+    """
+    Return a key identifying equivalent messages.
+
+    Timestamps, hex values and standalone numbers are masked so that repeats
+    of the same event with different counters compare equal. Numbers inside
+    identifiers (``Gi1/0/1``, ``10.0.0.1``) are kept. Source, facility and
+    level are part of the key.
+
+    Args:
+        message: Normalized message dict
+
+    Returns:
+        Hashable key
+    """
+    text = message.get("message")
+    normalized = VOLATILE_PATTERN.sub("#", text) if isinstance(text, str) else text
+    return hash((message.get("source"), message.get("facility"), message.get("level"), normalized))
+
+
+def collapse_duplicates(messages):
+    """
+    Fold runs of equivalent consecutive messages into one row.
+
+    Runs in a single pass. The newest message of each run is kept and gains
+    ``count``, ``first_timestamp`` (oldest in the run) and ``last_timestamp``.
+
+    Args:
+        messages: Normalized messages, newest first
+
+    Returns:
+        New list of messages
+    """
+    collapsed = []
+    previous = None
+    for log in messages:
+        message = log["message"]
+        key = message_fingerprint(message)
+        if key == previous:
+            row = collapsed[-1]["message"]
+            row["count"] += 1
+            row["first_timestamp"] = message.get("timestamp")
+            continue
+
+        previous = key
+        timestamp = message.get("timestamp")
+        collapsed.append(
+            {
+                **log,
+                "message": {**message, "count": 1, "first_timestamp": timestamp, "last_timestamp": timestamp},
+            }
+        )
+    return collapsed
+
+
+def merge_timelines(streams, limit):
+    """
+    K-way merge message lists that are each sorted newest first.
+
+    Args:
+        streams: Lists of normalized messages, each newest first
+        limit: Maximum number of messages to return
+
+    Returns:
+        Merged list of at most ``limit`` messages, newest first
+    """
+    merged = heapq.merge(*streams, key=lambda log: log["message"].get("timestamp") or "", reverse=True)
+    return list(islice(merged, limit))
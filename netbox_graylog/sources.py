@@ -0,0 +1,73 @@
+"""
+Graylog sources index
+
+A periodically refreshed snapshot of the message sources and remote IPs that
+Graylog has seen recently, built from terms aggregations. Looking a host up in
+the index is a set lookup or a binary search, which lets the client skip searches for
+objects that never log and replace leading-field wildcards with exact terms.
+"""
+
+import time
+from bisect import bisect_left
+
+
+class SourcesIndex:
+    """Compact lookup structure for known Graylog ``source`` and ``gl2_remote_ip`` values."""
+
+    __slots__ = ("sources", "ordered", "ips", "time_range", "complete", "built_at")
+
+    def __init__(self, sources, ips, time_range, complete=True, built_at=None):
+        """
+        Build the index.
+
+        Args:
+            sources: Iterable of ``source`` field values
+            ips: Iterable of ``gl2_remote_ip`` field values
+            time_range: Window in seconds the terms were collected over
+            complete: False if Graylog truncated either terms list
+            built_at: Epoch timestamp of the snapshot (default now)
+        """
+        self.sources = frozenset(source.lower() for source in sources if source)
+        self.ips = frozenset(ip for ip in ips if ip)
+        self.time_range = time_range
+        self.complete = complete
+        self.built_at = built_at or time.time()
+
+        # Sorted for prefix scans, so "switch01" finds "switch01.example.com" and "switch01-re0"
+        self.ordered = tuple(sorted(self.sources))
+
+    def __len__(self):
+        return len(self.sources) + len(self.ips)
+
+    def covers(self, time_range):
+        """Whether a search over ``time_range`` seconds can rely on this index."""
+        return time_range <= self.time_range
+
+    def match_host(self, hostname):
+        """
+        Return known sources for a hostname.
+
+        Matches every source starting with the hostname, like the ``hostname*``
+        wildcard search does (``switch01`` -> ``switch01.example.com``,
+        ``switch01-re0``).
+
+        Args:
+            hostname: Device/VM/Endpoint name
+
+        Returns:
+            Tuple of matching source values (lowercase)
+        """
+        hostname = hostname.lower()
+        start = bisect_left(self.ordered, hostname)
+        end = start
+        while end < len(self.ordered) and self.ordered[end].startswith(hostname):
+            end += 1
+        return self.ordered[start:end]
+
+    def has_ip(self, ip):
+        """Whether ``ip`` has been seen as a remote IP or as a source value."""
+        return ip in self.ips or ip in self.sources
+
+    def has_logs(self, hostname, ip=None):
+        """Whether a host is known by its hostname or its IP address."""
+        return bool(hostname and self.match_host(hostname)) or bool(ip and self.has_ip(ip))
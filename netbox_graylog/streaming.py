@@ -0,0 +1,133 @@
+"""
+Incremental decoding of Graylog search responses.
+
+With the optional ``ijson`` package (``pip install netbox-graylog[streaming]``)
+search responses are parsed straight from the streamed HTTP body. Each message
+is built, handed to a transform (normalization) and dropped before the next one
+is read, so only normalized messages are kept. Decoding stops early once a byte
+or message budget is reached. Without ``ijson`` the body is decoded with
+``response.json()`` as before.
+"""
+
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Bytes requested from the socket per read
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamBudgetReached(Exception):
+    """Raised by ``CountingReader`` once its byte budget is used up."""
+
+
+@lru_cache(maxsize=None)
+def load_ijson():
+    """Import ``ijson`` on first use; None if it isn't installed."""
+    try:
+        import ijson
+    except ImportError:
+        logger.debug("ijson not installed, decoding Graylog responses in one piece")
+        return None
+    return ijson
+
+
+class CountingReader:
+    """File-like wrapper around a raw HTTP body that stops at a byte budget."""
+
+    def __init__(self, raw, max_bytes=None):
+        """
+        Args:
+            raw: urllib3 response (``requests.Response.raw``)
+            max_bytes: Decoded bytes to read at most (None or 0 for no limit)
+        """
+        self.raw = raw
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = CHUNK_SIZE
+        if self.max_bytes:
+            left = self.max_bytes - self.bytes_read
+            if left <= 0:
+                # A body of exactly the budget still ends cleanly at EOF
+                if self.raw.read(1, decode_content=True):
+                    raise StreamBudgetReached(f"Response exceeded {self.max_bytes} bytes")
+                return b""
+            size = min(size, left)
+        # Decompress gzip/deflate bodies; the budget counts decoded bytes
+        chunk = self.raw.read(size, decode_content=True)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def decode_search(response, items_path, transform, max_bytes=None, max_messages=None):
+    """
+    Decode a search response, transforming its messages one at a time.
+
+    Args:
+        response: ``requests.Response``, requested with ``stream=True``
+        items_path: Keys leading to the message array, e.g. ``("messages",)``
+        transform: Callable applied to each raw message
+        max_bytes: Stop reading after this many decoded bytes (None or 0 for no limit)
+        max_messages: Stop after this many messages (None or 0 for no limit)
+
+    Returns:
+        ``(document, messages, truncated)``: the rest of the response as
+        decoded so far (without the message array), the transformed messages
+        and whether decoding stopped early. After an early stop, fields that
+        follow the messages in the body (such as ``total_results``) are missing.
+
+    Raises:
+        ValueError: if the body isn't valid JSON
+    """
+    ijson = load_ijson()
+    if ijson is None:
+        return _decode_whole(response, items_path, transform, max_messages)
+
+    prefix = ".".join((*items_path, "item"))
+    reader = CountingReader(response.raw, max_bytes)
+    document = ijson.ObjectBuilder()
+    messages = []
+    item = None
+    truncated = False
+    try:
+        for path, event, value in ijson.parse(reader, use_float=True):
+            if item is not None:
+                item.event(event, value)
+                if path == prefix and event == "end_map":
+                    messages.append(transform(item.value))
+                    item = None
+            elif path == prefix and event == "start_map":
+                if max_messages and len(messages) >= max_messages:
+                    # Only a message past the budget makes the result incomplete
+                    truncated = True
+                    break
+                item = ijson.ObjectBuilder()
+                item.event(event, value)
+            else:
+                document.event(event, value)
+    except StreamBudgetReached as e:
+        logger.warning(f"Stopped decoding Graylog response early: {e}")
+        truncated = True
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid JSON from Graylog: {e}")
+
+    if truncated:
+        logger.debug(f"Decoded {len(messages)} messages from {reader.bytes_read} bytes before stopping")
+    return getattr(document, "value", None) or {}, messages, truncated
+
+
+def _decode_whole(response, items_path, transform, max_messages=None):
+    """Fallback for ``decode_search`` without ``ijson``: decode the whole body at once."""
+    document = response.json()
+    parent = document
+    for key in items_path[:-1]:
+        parent = parent.get(key) or {}
+    items = (parent.pop(items_path[-1], None) if isinstance(parent, dict) else None) or []
+    truncated = bool(max_messages) and len(items) > max_messages
+    if truncated:
+        items = items[:max_messages]
+    return document, [transform(item) for item in items], truncated
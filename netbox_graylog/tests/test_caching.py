@@ -0,0 +1,50 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache as shared_cache
+from django.test import SimpleTestCase, override_settings
+
+from netbox_graylog.caching import TieredCache
+
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(PLUGINS_CONFIG={"netbox_graylog": {}}, CACHES=CACHES)
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        self.writer = TieredCache()
+        self.reader = TieredCache()
+
+    def test_l2_hit_fills_l1_without_pickling(self):
+        value = {"messages": [{"message": "x" * 100}]}
+        self.writer.set("key", value)
+
+        with mock.patch("netbox_graylog.caching.pickle.dumps") as dumps:
+            self.assertEqual(self.reader.get("key"), value)
+            self.assertEqual(self.reader.get_many(["key"]), {"key": value})
+        dumps.assert_not_called()
+        self.assertEqual(self.reader.local.size, self.writer.local.size)
+
+    def test_entries_written_without_size_are_still_read(self):
+        shared_cache.set("key", {"total": 1})
+        self.assertEqual(self.reader.get("key"), {"total": 1})
+        self.assertGreater(self.reader.local.size, 0)
+
+    def test_l1_fill_never_outlives_the_l2_entry(self):
+        self.writer.set("key", {"total": 1}, 2)
+        self.reader.get("key")
+        expires, _, _ = self.reader.local._entries["key"]
+        self.assertLessEqual(expires - time.monotonic(), 2)
+
+
+@override_settings(PLUGINS_CONFIG={"netbox_graylog": {"local_cache_size": 0}}, CACHES=CACHES)
+class DisabledLocalCacheTests(SimpleTestCase):
+    def test_values_are_stored_as_is_without_l1(self):
+        shared_cache.clear()
+        cache = TieredCache()
+        with mock.patch("netbox_graylog.caching._pickled_size") as pickled_size:
+            cache.set("key", {"total": 1})
+        pickled_size.assert_not_called()
+        self.assertEqual(shared_cache.get("key"), {"total": 1})
+        self.assertEqual(cache.get("key"), {"total": 1})
@@ -0,0 +1,219 @@
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.core.cache import cache as shared_cache
+from django.test import SimpleTestCase, override_settings
+
+from netbox_graylog.caching import cache
+from netbox_graylog.graylog_client import (
+    LIST_FIELDS,
+    SOURCES_INDEX_CACHE_KEY,
+    GraylogClient,
+    deadline,
+    normalize_message,
+)
+from netbox_graylog.sources import SourcesIndex
+from netbox_graylog.utils import format_timestamp
+
+PLUGINS_CONFIG = {
+    "netbox_graylog": {
+        "graylog_api_token": "token",
+        "use_views_api": False,
+        "sources_index": False,
+    }
+}
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def make_messages(count, newest_age=60, spacing=10):
+    """Normalized messages, newest first, ``spacing`` seconds apart."""
+    now = datetime.now(timezone.utc)
+    return [
+        normalize_message(
+            {
+                "index": "graylog_0",
+                "message": {
+                    "_id": f"id-{position}",
+                    "timestamp": format_timestamp(now - timedelta(seconds=newest_age + position * spacing)),
+                    "source": "switch01",
+                    "level": 6,
+                    "message": f"message {position}",
+                },
+            }
+        )
+        for position in range(count)
+    ]
+
+
+@override_settings(PLUGINS_CONFIG=PLUGINS_CONFIG, CACHES=CACHES)
+class RangeSubsumptionTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        if cache.local is not None:
+            cache.local.clear()
+        self.client = GraylogClient()
+        self.client._get = mock.Mock(return_value=mock.Mock(status_code=200))
+
+    def search(self, time_range, decoded):
+        with mock.patch.object(self.client, "_decode_search", return_value=decoded):
+            return self.client.search_logs("source:switch01", time_range=time_range, limit=100)
+
+    def test_truncated_result_is_not_reused_for_a_smaller_window(self):
+        # A 24h search cut off by the byte budget before ``total_results``
+        day = self.search(86400, ({}, make_messages(61), True))
+        self.assertTrue(day["truncated"])
+        self.assertIsNotNone(day["next_cursor"])
+
+        # The 1h window must be asked of Graylog, not filtered from the partial 24h result
+        hour = self.search(3600, ({"total_results": 200}, make_messages(100), False))
+        self.assertEqual(self.client._get.call_count, 2)
+        self.assertEqual(hour["total_results"], 200)
+        self.assertIsNotNone(hour["next_cursor"])
+
+    def test_result_without_reported_total_is_not_complete(self):
+        self.search(86400, ({}, make_messages(61), False))
+        self.search(3600, ({"total_results": 200}, make_messages(100), False))
+        self.assertEqual(self.client._get.call_count, 2)
+
+    def test_complete_result_serves_smaller_window(self):
+        # 40 messages spanning about 7 minutes, all Graylog has in 24h
+        self.search(86400, ({"total_results": 40}, make_messages(40), False))
+        hour = self.search(3600, ({"total_results": 0}, [], False))
+        self.assertEqual(self.client._get.call_count, 1)
+        self.assertEqual(hour["total_results"], 40)
+        self.assertIsNone(hour["next_cursor"])
+
+
+@override_settings(PLUGINS_CONFIG={"netbox_graylog": {"graylog_api_token": "token"}}, CACHES=CACHES)
+class SourcesIndexRefreshTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        if cache.local is not None:
+            cache.local.clear()
+        self.client = GraylogClient()
+        self.client.build_sources_index = mock.Mock(return_value=SourcesIndex(["switch01"], [], 86400))
+        patcher = mock.patch("netbox_graylog.graylog_client.threading.Thread")
+        self.thread = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_budgeted_load_never_builds_the_index(self):
+        with deadline(5):
+            self.assertIsNone(self.client.get_sources_index())
+        self.client.build_sources_index.assert_not_called()
+
+    def test_expired_index_is_served_while_one_refresh_runs(self):
+        previous = SourcesIndex(["old"], [], 86400, built_at=time.time() - 3600)
+        cache.set(SOURCES_INDEX_CACHE_KEY, previous)
+
+        self.assertEqual(self.client.get_sources_index().sources, previous.sources)
+        self.assertEqual(self.client.get_sources_index().sources, previous.sources)
+        self.client.build_sources_index.assert_not_called()
+        self.thread.assert_called_once()
+
+        self.thread.call_args.kwargs["target"]()
+        self.assertEqual(self.client.get_sources_index().sources, frozenset(["switch01"]))
+
+
+@override_settings(PLUGINS_CONFIG=PLUGINS_CONFIG, CACHES=CACHES)
+class LogSummaryBudgetTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        if cache.local is not None:
+            cache.local.clear()
+        self.client = GraylogClient()
+        patcher = mock.patch("netbox_graylog.graylog_client.threading.Thread")
+        self.thread = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_summary_past_the_budget_is_fetched_in_the_background(self):
+        exhausted = {"error": "Latency budget exhausted", "messages": [], "budget_exhausted": True}
+        with mock.patch.object(self.client, "search_logs", return_value=exhausted):
+            self.assertTrue(self.client.get_log_summary(time_range=3600)["pending"])
+            self.client.get_log_summary(time_range=3600)
+        self.thread.assert_called_once()
+
+        counts = {"total_results": 42, "messages": [], "facets": {"levels": [{"value": "3", "count": 2}]}}
+        with mock.patch.object(self.client, "search_logs", return_value=counts):
+            self.thread.call_args.kwargs["target"](*self.thread.call_args.kwargs["args"])
+        summary = self.client.get_log_summary(time_range=3600)
+        self.assertEqual((summary["total"], summary["errors"], summary["cached"]), (42, 2, True))
+
+
+@override_settings(
+    PLUGINS_CONFIG={"netbox_graylog": {**PLUGINS_CONFIG["netbox_graylog"], "use_views_api": True}}, CACHES=CACHES
+)
+class ViewsSearchTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        if cache.local is not None:
+            cache.local.clear()
+        self.client = GraylogClient()
+        self.client._post = mock.Mock(return_value=mock.Mock(status_code=200))
+        patcher = mock.patch.object(self.client, "_decode_search", return_value=({}, [], False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def requested_fields(self):
+        search_types = self.client._post.call_args.kwargs["json"]["queries"][0]["search_types"]
+        return next(search_type["fields"] for search_type in search_types if search_type["type"] == "messages")
+
+    def test_messages_search_type_requests_list_fields(self):
+        self.client.search_logs("source:switch01", time_range=3600)
+        self.assertEqual(self.requested_fields(), list(LIST_FIELDS))
+
+    def test_messages_search_type_requests_custom_fields(self):
+        self.client.search_logs("source:switch01", time_range=3600, fields=["_id", "timestamp", "message"])
+        self.assertEqual(self.requested_fields(), ["_id", "timestamp", "message"])
+
+
+@override_settings(
+    PLUGINS_CONFIG={"netbox_graylog": {**PLUGINS_CONFIG["netbox_graylog"], "use_views_api": True}}, CACHES=CACHES
+)
+class TermsTests(SimpleTestCase):
+    def setUp(self):
+        self.client = GraylogClient()
+        self.client._get = mock.Mock()
+
+    def pivot_response(self, values, total):
+        rows = [{"key": [value], "source": "leaf", "values": [{"value": count}]} for value, count in values.items()]
+        rows.append({"key": [], "source": "non-leaf", "values": [{"value": total}]})
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"results": {"q": {"search_types": {"terms": {"rows": rows, "total": total}}}}}
+        return response
+
+    def test_terms_come_from_a_views_pivot(self):
+        self.client._post = mock.Mock(return_value=self.pivot_response({"switch01": 5, "switch02": 3}, 8))
+        terms = self.client._terms("source", 86400, 10)
+        self.assertEqual(terms, {"terms": {"switch01": 5, "switch02": 3}, "other": 0})
+        self.client._get.assert_not_called()
+
+    def test_full_page_of_terms_is_reported_as_cut_off(self):
+        self.client._post = mock.Mock(return_value=self.pivot_response({"switch01": 5, "switch02": 3}, 10))
+        self.assertEqual(self.client._terms("source", 86400, 2)["other"], 2)
+
+    def test_legacy_terms_endpoint_without_views_api(self):
+        self.client._post = mock.Mock(return_value=mock.Mock(status_code=404))
+        self.client._get.return_value.json.return_value = {"terms": {"switch01": 5}, "other": 0}
+        self.assertEqual(self.client._terms("source", 86400, 10)["terms"], {"switch01": 5})
+        self.assertFalse(self.client.views_api)
+
+
+@override_settings(PLUGINS_CONFIG={"netbox_graylog": {"graylog_api_token": "token"}}, CACHES=CACHES)
+class IndexedQueryTests(SimpleTestCase):
+    def setUp(self):
+        self.client = GraylogClient()
+
+    def resolve(self, hostname, built_at=None):
+        index = SourcesIndex(["switch01-re0", "router01"], [], 86400, built_at=built_at)
+        with mock.patch.object(self.client, "get_sources_index", return_value=index):
+            return self.client._indexed_query(hostname, None, 3600)
+
+    def test_prefix_match_is_searched(self):
+        self.assertEqual(self.resolve("switch01"), ('source:"switch01-re0"', "hostname"))
+
+    def test_fresh_index_proves_absence(self):
+        self.assertEqual(self.resolve("switch02"), (None, "not_indexed"))
+
+    def test_aging_index_falls_back_to_wildcard(self):
+        self.assertIsNone(self.resolve("switch02", built_at=time.time() - 300))
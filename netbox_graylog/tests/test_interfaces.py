@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+
+from netbox_graylog.graylog_client import normalize_message
+from netbox_graylog.interfaces import build_interface_index, index_messages
+
+
+class InterfaceIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.interfaces = build_interface_index(["GigabitEthernet1/0/1", "GigabitEthernet1/0/10"])
+
+    def normalize(self, text, preview_length=300):
+        return normalize_message({"index": "graylog_0", "message": {"_id": "a", "message": text}}, preview_length)
+
+    def test_abbreviations_match_netbox_names(self):
+        messages = [self.normalize("%LINK-3-UPDOWN: Interface Gi1/0/10, changed state to down")]
+        self.assertEqual(index_messages(messages, self.interfaces), {"GigabitEthernet1/0/10": (0,)})
+
+    def test_mentions_past_the_preview_are_indexed(self):
+        message = self.normalize("x" * 400 + " Interface Gi1/0/1 went down")
+        self.assertTrue(message["message"]["truncated"])
+        self.assertEqual(index_messages([message], self.interfaces), {"GigabitEthernet1/0/1": (0,)})
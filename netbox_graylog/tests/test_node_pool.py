@@ -0,0 +1,88 @@
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from netbox_graylog.graylog_client import GraylogClient
+from netbox_graylog.node_pool import NodePool, parse_node_urls
+
+NODES = ["http://graylog1:9000", "http://graylog2:9000", "http://graylog3:9000"]
+
+
+class NodePoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = NodePool(NODES, health_check_interval=0)
+
+    def test_parse_node_urls(self):
+        self.assertEqual(parse_node_urls("http://a:9000/, http://b:9000"), ["http://a:9000", "http://b:9000"])
+        self.assertEqual(parse_node_urls(["http://a:9000", ""]), ["http://a:9000"])
+
+    def test_acquire_prefers_fewest_in_flight_then_latency(self):
+        self.pool.nodes[0].latency = 0.5
+        self.pool.nodes[1].latency = 0.1
+        self.pool.nodes[2].latency = 0.2
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.assertEqual((first.url, second.url), (NODES[1], NODES[2]))
+        self.assertEqual(first.in_flight, 1)
+
+    def test_acquire_skips_down_and_excluded_nodes(self):
+        self.pool.nodes[0].healthy = False
+        self.assertEqual(self.pool.acquire(exclude={NODES[1]}).url, NODES[2])
+        self.assertIsNone(self.pool.acquire(exclude=set(NODES)))
+
+    def test_acquire_falls_back_to_down_nodes_when_all_are_down(self):
+        for node in self.pool.nodes:
+            node.healthy = False
+        self.assertIsNotNone(self.pool.acquire())
+
+    def test_release_records_outcome(self):
+        node = self.pool.acquire()
+        self.pool.release(node, failed=True)
+        self.assertEqual((node.healthy, node.failures, node.in_flight), (False, 1, 0))
+
+        self.pool.acquire()
+        self.pool.release(node, elapsed=1.0)
+        self.pool.acquire()
+        self.pool.release(node, elapsed=2.0)
+        self.assertEqual((node.healthy, node.failures), (True, 0))
+        self.assertAlmostEqual(node.latency, 1.3)
+
+
+@override_settings(
+    PLUGINS_CONFIG={"netbox_graylog": {"graylog_url": NODES, "graylog_api_token": "token", "health_check_interval": 0}}
+)
+class RequestFailoverTests(SimpleTestCase):
+    def setUp(self):
+        self.client = GraylogClient()
+        patcher = mock.patch("requests.request")
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def requested_nodes(self):
+        return [call.args[1].rsplit("/api/", 1)[0] for call in self.request.call_args_list]
+
+    def test_connect_failure_fails_over_and_marks_node_down(self):
+        self.request.side_effect = [requests.exceptions.ConnectTimeout(), mock.Mock(status_code=200)]
+        self.assertEqual(self.client._get("/api/system").status_code, 200)
+        self.assertEqual(len(self.requested_nodes()), 2)
+        failed = next(node for node in self.client.pool.nodes if node.url == self.requested_nodes()[0])
+        self.assertFalse(failed.healthy)
+
+    def test_gateway_error_fails_over(self):
+        self.request.side_effect = [mock.Mock(status_code=503), mock.Mock(status_code=200)]
+        self.assertEqual(self.client._get("/api/system").status_code, 200)
+        self.assertEqual(len(set(self.requested_nodes())), 2)
+
+    def test_read_timeout_is_not_retried_elsewhere(self):
+        self.request.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.client._get("/api/search/universal/relative")
+        self.assertEqual(self.request.call_count, 1)
+        self.assertTrue(all(node.healthy for node in self.client.pool.nodes))
+
+    def test_every_node_refusing_raises_the_last_error(self):
+        self.request.side_effect = requests.exceptions.ConnectionError()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client._get("/api/system")
+        self.assertEqual(sorted(self.requested_nodes()), NODES)
@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase
+
+from netbox_graylog.sources import SourcesIndex
+
+
+class SourcesIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SourcesIndex(
+            ["Switch01.example.com", "switch01-re0", "switch01b", "switch010", "switch02", "router01"],
+            ["10.0.0.1"],
+            time_range=86400,
+        )
+
+    def test_match_host_keeps_wildcard_prefix_semantics(self):
+        self.assertEqual(
+            self.index.match_host("switch01"),
+            ("switch01-re0", "switch01.example.com", "switch010", "switch01b"),
+        )
+
+    def test_match_host_without_match(self):
+        self.assertEqual(self.index.match_host("switch03"), ())
+        self.assertFalse(self.index.has_logs("switch03"))
+        self.assertTrue(self.index.has_logs("switch03", "10.0.0.1"))
@@ -0,0 +1,43 @@
+import io
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from netbox_graylog.streaming import decode_search, load_ijson
+
+
+class RawBody(io.BytesIO):
+    """Stands in for ``requests.Response.raw``."""
+
+    def read(self, size=-1, decode_content=False):
+        return super().read(size)
+
+
+def make_response(messages, total):
+    body = json.dumps({"messages": [{"message": {"_id": str(n)}} for n in range(messages)], "total_results": total})
+    return mock.Mock(raw=RawBody(body.encode())), len(body)
+
+
+class DecodeSearchTests(SimpleTestCase):
+    def setUp(self):
+        if load_ijson() is None:
+            self.skipTest("ijson not installed")
+
+    def test_body_of_exactly_the_byte_budget_is_complete(self):
+        response, size = make_response(50, 50)
+        document, messages, truncated = decode_search(response, ("messages",), dict, max_bytes=size)
+        self.assertEqual((len(messages), document["total_results"], truncated), (50, 50, False))
+
+    def test_body_past_the_byte_budget_is_truncated(self):
+        response, size = make_response(50, 50)
+        document, messages, truncated = decode_search(response, ("messages",), dict, max_bytes=size - 1)
+        self.assertTrue(truncated)
+        self.assertNotIn("total_results", document)
+
+    def test_message_budget_only_truncates_when_more_messages_follow(self):
+        response, _ = make_response(5, 5)
+        self.assertFalse(decode_search(response, ("messages",), dict, max_messages=5)[2])
+        response, _ = make_response(6, 6)
+        _, messages, truncated = decode_search(response, ("messages",), dict, max_messages=5)
+        self.assertEqual((len(messages), truncated), (5, True))
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from netbox_graylog.utils import bind_cursor, cursor_owner, decode_cursor, encode_cursor
+
+
+def make_object(label, pk):
+    return SimpleNamespace(_meta=SimpleNamespace(label_lower=label), pk=pk)
+
+
+class CursorTests(SimpleTestCase):
+    def setUp(self):
+        self.token = encode_cursor(
+            "source:switch01*", 3600, "2026-01-01T00:00:00.000Z", "2026-01-01T01:00:00.000Z", {"a"}
+        )
+        self.device = cursor_owner(make_object("dcim.device", 5))
+
+    def test_bound_cursor_decodes_for_its_object(self):
+        cursor = decode_cursor(bind_cursor(self.token, self.device), self.device)
+        self.assertEqual((cursor["query"], cursor["seen_ids"]), ("source:switch01*", frozenset({"a"})))
+
+    def test_bound_cursor_is_rejected_for_another_object(self):
+        token = bind_cursor(self.token, self.device)
+        self.assertIsNone(decode_cursor(token, cursor_owner(make_object("dcim.device", 6))))
+        self.assertIsNone(decode_cursor(token, cursor_owner(make_object("virtualization.virtualmachine", 5))))
+
+    def test_unbound_cursor_is_rejected_for_an_object(self):
+        self.assertIsNone(decode_cursor(self.token, self.device))
@@ -11,7 +11,9 @@ urlpatterns = [
     path("settings/", views.GraylogSettingsView.as_view(), name="settings"),
     path("test-connection/", views.TestConnectionView.as_view(), name="test_connection"),
     path("device/<int:pk>/content/", views.DeviceGraylogContentView.as_view(), name="device_content"),
+    path("interface/<int:pk>/content/", views.InterfaceGraylogContentView.as_view(), name="interface_content"),
     path("vm/<int:pk>/content/", views.VMGraylogContentView.as_view(), name="vm_content"),
+    path("message/<str:index>/<str:message_id>/", views.MessageDetailView.as_view(), name="message_detail"),
 ]
 
 # Add endpoint URLs if netbox_endpoints is installed
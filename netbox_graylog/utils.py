@@ -0,0 +1,156 @@
+"""
+Helpers shared by the Graylog client and views.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from urllib.parse import urlencode
+
+from django.core import signing
+
+CURSOR_SALT = "netbox_graylog.cursor"
+
+# Query parameters a tab page forwards to its HTMX content endpoint
+CONTENT_PARAMS = ("range", "collapse", "view")
+
+
+def content_params(request):
+    """Return the tab page's content parameters as a query string for the HTMX URL."""
+    return urlencode([(name, request.GET[name]) for name in CONTENT_PARAMS if request.GET.get(name)])
+
+
+@lru_cache(maxsize=None)
+def get_endpoint_model():
+    """
+    Return the netbox_endpoints ``Endpoint`` model if that plugin is installed.
+
+    Resolved once per process from the app registry, so the views, URLs, API
+    and ``ready()`` agree without each probing for the package. Must not be
+    called before the app registry has loaded models.
+
+    Returns:
+        Endpoint model class, or None
+    """
+    from django.apps import apps
+
+    if not apps.is_installed("netbox_endpoints"):
+        return None
+    try:
+        return apps.get_model("netbox_endpoints", "Endpoint")
+    except LookupError:
+        return None
+
+
+def get_bool_param(request, name, default=False):
+    """Read a ``0``/``1`` style boolean query parameter."""
+    value = request.GET.get(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def format_timestamp(dt):
+    """Format a datetime the way Graylog does (UTC, millisecond precision, ``Z`` suffix)."""
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def parse_timestamp(value):
+    """
+    Parse a Graylog timestamp string.
+
+    Args:
+        value: ISO 8601 timestamp such as ``2026-01-26T10:00:00.123Z``
+
+    Returns:
+        Timezone-aware datetime, or None if the value can't be parsed
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+
+
+def window_start(time_range):
+    """Return the Graylog timestamp ``time_range`` seconds before now."""
+    return format_timestamp(datetime.now(timezone.utc) - timedelta(seconds=time_range))
+
+
+def encode_cursor(query, time_range, start, timestamp, seen_ids):
+    """
+    Encode a keyset pagination cursor.
+
+    The cursor is signed because it carries the resolved Graylog query; a
+    client can't use it to run arbitrary searches.
+
+    Args:
+        query: Lucene query of the first page
+        time_range: Time range in seconds of the first page
+        start: Timestamp of the start of the search window
+        timestamp: Timestamp of the last message already shown
+        seen_ids: Ids of shown messages that carry exactly ``timestamp``
+
+    Returns:
+        URL-safe cursor string
+    """
+    return signing.dumps(
+        {"q": query, "r": time_range, "f": start, "t": timestamp, "i": sorted(seen_ids)},
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def cursor_owner(obj):
+    """Label tying a cursor to one object, e.g. ``dcim.device:5``."""
+    return f"{obj._meta.label_lower}:{obj.pk}"
+
+
+def bind_cursor(token, owner):
+    """
+    Re-sign a cursor so it's only accepted for one object.
+
+    Results (and their cursors) are cached per query, which objects can share,
+    so cursors are bound when a view hands them out rather than when created.
+
+    Args:
+        token: Cursor string from ``encode_cursor``, or None
+        owner: ``cursor_owner`` of the object the cursor is handed out for
+
+    Returns:
+        Bound cursor string, or None if ``token`` is missing or invalid
+    """
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    return signing.dumps({**data, "o": owner}, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, owner=None):
+    """
+    Decode a cursor created by ``encode_cursor``.
+
+    Args:
+        token: Cursor string
+        owner: ``cursor_owner`` the cursor must be bound to (see ``bind_cursor``)
+
+    Returns:
+        dict with ``query``, ``time_range``, ``from``, ``to`` and ``seen_ids``,
+        or None if the cursor is invalid, tampered with or bound to another object
+    """
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+        if data.get("o") != owner:
+            return None
+        return {
+            "query": data["q"],
+            "time_range": int(data["r"]),
+            "from": data["f"],
+            "to": data["t"],
+            "seen_ids": frozenset(data["i"]),
+        }
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
@@ -1,32 +1,276 @@
 """
 Views for NetBox Graylog Plugin
 
-Registers custom tabs on Device and VirtualMachine detail views.
+Registers custom tabs on Device, Interface and VirtualMachine detail views.
 Provides settings configuration UI.
 """
 
-from dcim.models import Device
+import hashlib
+
+from dcim.models import CablePath, Device, Interface
+from dcim.utils import decompile_path_node
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.http import HttpResponse, JsonResponse
+from django.contrib.contenttypes.models import ContentType
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
+from django.utils.http import parse_etags, quote_etag
 from django.views import View
 from netbox.views import generic
 from utilities.views import ViewTab, register_model_view
 from virtualization.models import VirtualMachine
 
+from . import __version__
+from .caching import cache
 from .forms import GraylogSettingsForm
-from .graylog_client import get_client
+from .graylog_client import deadline, fingerprint_result, get_client
+from .processing import collapse_duplicates, severity_facets
+from .utils import bind_cursor, content_params, cursor_owner, get_bool_param, get_endpoint_model
+
+# netbox_endpoints integration, resolved once from the app registry
+Endpoint = get_endpoint_model()
+ENDPOINTS_PLUGIN_INSTALLED = Endpoint is not None
+
+CONTENT_TEMPLATE = "netbox_graylog/logs_tab_content.html"
+ROWS_TEMPLATE = "netbox_graylog/logs_rows.html"
+
+# Part of every ETag and fragment cache key; bump the suffix when the content
+# template changes so browsers and the cache don't serve stale markup.
+CONTENT_TEMPLATE_VERSION = f"{__version__}-11"
+
+
+def content_etag(*parts):
+    """Build an ETag value from the result fingerprint and rendering inputs."""
+    return hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=16).hexdigest()
+
+
+def get_cabled_neighbors(device, limit, queryset=None):
+    """
+    Return the devices at the far end of a device's connected interfaces.
+
+    Follows cable paths, so neighbors behind patch panels are found too. The
+    far-end interfaces are read from the device's complete CablePaths in one
+    query and their devices loaded in another, ordered by name.
+
+    Args:
+        device: NetBox Device object
+        limit: Maximum number of neighbors
+        queryset: Devices that may be returned (default all)
+
+    Returns:
+        ``(neighbors, omitted)``: list of Device objects, excluding the device
+        itself, and the number of further neighbors left out by ``limit``
+    """
+    interface_type = ContentType.objects.get_for_model(Interface).pk
+    far_ends = set()
+    paths = CablePath.objects.filter(
+        pk__in=device.interfaces.filter(_path__isnull=False).values("_path"), is_complete=True
+    ).values_list("path", flat=True)
+    for path in paths:
+        for node in path[-1] if path else ():
+            type_id, object_id = decompile_path_node(node)
+            if type_id == interface_type:
+                far_ends.add(object_id)
+    if not far_ends:
+        return [], 0
+
+    neighbors = (
+        (queryset if queryset is not None else Device.objects.all())
+        .filter(interfaces__in=far_ends)
+        .exclude(pk=device.pk)
+        .select_related("virtual_chassis", "primary_ip4")
+        .distinct()
+        .order_by("name", "pk")
+    )
+    found = list(neighbors[: limit + 1])
+    if len(found) <= limit:
+        return found, 0
+    return found[:limit], neighbors.count() - limit
+
+
+class GraylogContentMixin:
+    """
+    Shared fetching and rendering for the HTMX log content endpoints.
+
+    Subclasses set ``queryset`` and implement ``get_logs``. Requests carrying a
+    ``cursor`` return only the next page of table rows for infinite scroll.
+    Subclasses that implement ``get_host`` are loaded within the
+    ``latency_budget`` (see ``get_logs_within_budget``) unless ``full=1``.
+    """
+
+    queryset = None
+    default_search_type = "hostname"
+    # Whether the "Correlated" view (object plus cabled neighbors) is offered
+    correlation_available = False
 
-# Check if netbox_endpoints plugin is installed
-try:
-    from netbox_endpoints.models import Endpoint
+    def get_logs(self, client, obj, time_range):
+        """Fetch the first page of logs for ``obj``."""
+        raise NotImplementedError
+
+    def get_host(self, client, obj):
+        """Return ``(hostname, ip)`` for the fast first stage, or None to load without a budget."""
+        return None
+
+    def get(self, request, pk):
+        """Fetch Graylog logs and return HTML content."""
+        obj = self.queryset.get(pk=pk)
+        client = get_client()
+
+        cursor = request.GET.get("cursor")
+        if cursor:
+            logs_data = client.get_page(cursor, owner=cursor_owner(obj))
+        else:
+            # Get time range from query params (default to config value)
+            time_range = self.get_time_range(request)
+            budget = client.config.get("latency_budget", 2.0)
+            host = None if get_bool_param(request, "full") or not budget else self.get_host(client, obj)
+            if host is not None:
+                logs_data = self.get_logs_within_budget(client, obj, time_range, host, budget)
+            else:
+                logs_data = self.get_logs(client, obj, time_range)
+
+        return self.render_logs(request, obj, logs_data)
+
+    def get_logs_within_budget(self, client, obj, time_range, host, budget):
+        """
+        Load logs progressively within a latency budget.
+
+        A cached full result is returned as is. Otherwise a fast narrow query
+        runs first and the full query gets whatever time is left. If the full
+        query can't finish in time, the fast result is returned flagged
+        ``partial`` and the fragment loads the full result with ``full=1``.
+
+        Args:
+            client: GraylogClient
+            obj: Object the tab belongs to
+            time_range: Requested time range in seconds, or None
+            host: ``(hostname, ip)`` from ``get_host``
+            budget: Latency budget in seconds
+
+        Returns:
+            Result dict
+        """
+        # A zero budget only allows cache hits
+        with deadline(0):
+            logs_data = self.get_logs(client, obj, time_range)
+        if not logs_data.get("budget_exhausted"):
+            return logs_data
+
+        with deadline(budget):
+            fast = client.get_fast_logs(*host, time_range=time_range)
+            logs_data = self.get_logs(client, obj, time_range)
+        if not logs_data.get("budget_exhausted"):
+            return logs_data
+
+        if fast.get("error"):
+            # Nothing to show yet; the fragment goes straight to the full load
+            fast = {"messages": [], "total_results": 0, "query": logs_data.get("query", "")}
+        return {
+            **fast,
+            "partial": True,
+            "next_cursor": None,
+            "fast_time_range": fast.get("time_range"),
+            "time_range": time_range or client.config.get("time_range", 3600),
+        }
+
+    def get_time_range(self, request):
+        """Return the ``range`` query param as an int, or None if absent/invalid."""
+        time_range = request.GET.get("range", None)
+        if time_range:
+            try:
+                return int(time_range)
+            except ValueError:
+                return None
+        return None
+
+    def render_logs(self, request, obj, logs_data):
+        """
+        Render the log table fragment for an object.
+
+        Successful results are served with an ETag derived from the result
+        fingerprint, so an unchanged refresh is answered with 304 Not Modified.
+        The rendered fragment is cached under the same key to skip template
+        rendering when the result came from cache.
+        """
+        config = settings.PLUGINS_CONFIG.get("netbox_graylog", {})
+        template_name = ROWS_TEMPLATE if request.GET.get("cursor") else CONTENT_TEMPLATE
+        collapse = get_bool_param(request, "collapse", config.get("collapse_duplicates", False))
+
+        # Get external Graylog URL for browser links
+        graylog_base_url = get_client().external_url
+
+        view = request.GET.get("view", "") if self.correlation_available else ""
+
+        logs = logs_data.get("messages", [])
+        if collapse and logs:
+            logs = collapse_duplicates(logs)
+
+        facets = logs_data.get("facets") or {}
+
+        context = {
+            "object": obj,
+            "logs": logs,
+            "severity_facets": severity_facets(facets.get("levels")),
+            "facility_facets": facets.get("facilities"),
+            "program_facets": facets.get("programs"),
+            "error": logs_data.get("error"),
+            "total_results": logs_data.get("total_results", 0),
+            "query": logs_data.get("query", ""),
+            "time_range": logs_data.get("time_range", 3600),
+            "search_type": logs_data.get("search_type", self.default_search_type),
+            "graylog_base_url": graylog_base_url,
+            # Cursors only page through the logs of the object they were handed out for
+            "next_cursor": bind_cursor(logs_data.get("next_cursor"), cursor_owner(obj)),
+            "content_url": request.path,
+            "collapse": collapse,
+            "view": view,
+            "correlation_available": self.correlation_available,
+            "devices": logs_data.get("devices"),
+            "warnings": logs_data.get("warnings"),
+            "omitted_neighbors": logs_data.get("omitted_neighbors", 0),
+            "interface": logs_data.get("interface"),
+            "scanned": logs_data.get("scanned"),
+            "response_truncated": logs_data.get("truncated", False),
+            "partial": logs_data.get("partial", False),
+            "fast_time_range": logs_data.get("fast_time_range"),
+        }
+
+        # Errors are never cached by the client, so don't let browsers keep them either
+        if context["error"]:
+            return HttpResponse(render_to_string(template_name, context, request=request))
+
+        etag = content_etag(
+            CONTENT_TEMPLATE_VERSION,
+            template_name,
+            request.path,
+            collapse,
+            view,
+            context["partial"],
+            context["search_type"],
+            context["omitted_neighbors"],
+            # A partial result carries the fast query's fingerprint, which is
+            # the same for every range past ``fast_time_range``
+            context["time_range"],
+            context["fast_time_range"],
+            graylog_base_url,
+            logs_data.get("fingerprint") or fingerprint_result(logs_data),
+        )
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            fragment_key = f"graylog_fragment_{etag}"
+            html = cache.get(fragment_key)
+            if html is None:
+                html = render_to_string(template_name, context, request=request)
+                cache.set(fragment_key, html, config.get("cache_timeout", 60))
+            response = HttpResponse(html)
 
-    ENDPOINTS_PLUGIN_INSTALLED = True
-except ImportError:
-    ENDPOINTS_PLUGIN_INSTALLED = False
+        response["ETag"] = quote_etag(etag)
+        # Let the browser keep the fragment but always revalidate it with us
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
 
 @register_model_view(Device, name="graylog_logs", path="logs")
@@ -47,8 +291,8 @@ class DeviceGraylogLogsView(generic.ObjectView):
         """Render initial tab with loading spinner - content loads via htmx."""
         device = Device.objects.get(pk=pk)
 
-        # Pass time_range for htmx URL construction
-        time_range = request.GET.get("range", "")
+        # Pass range/collapse params for htmx URL construction
+        params = content_params(request)
 
         return render(
             request,
@@ -57,75 +301,79 @@ class DeviceGraylogLogsView(generic.ObjectView):
                 "object": device,
                 "tab": self.tab,
                 "loading": True,
-                "time_range_param": time_range,
+                "content_params": params,
             },
         )
 
 
-class DeviceGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class DeviceGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, GraylogContentMixin, View):
     """HTMX endpoint that returns Graylog content for async loading."""
 
     permission_required = "dcim.view_device"
+    queryset = Device.objects.all()
+    correlation_available = True
+
+    def get_logs(self, client, device, time_range):
+        if self.request.GET.get("view") == "correlated":
+            # Only include neighbors the user may view
+            neighbors, omitted = get_cabled_neighbors(
+                device,
+                client.config.get("correlation_max_neighbors", 16),
+                queryset=Device.objects.restrict(self.request.user, "view"),
+            )
+            logs_data = client.get_correlated_logs(device, neighbors, time_range=time_range)
+            if omitted:
+                logs_data["omitted_neighbors"] = omitted
+            return logs_data
+        return client.get_logs_for_device(device, time_range=time_range)
 
-    def get(self, request, pk):
-        """Fetch Graylog logs and return HTML content."""
-        device = Device.objects.get(pk=pk)
+    def get_host(self, client, device):
+        # The correlated view runs its searches concurrently instead
+        if self.request.GET.get("view") == "correlated":
+            return None
+        return client.device_host(device)
 
-        # Get time range from query params (default to config value)
-        time_range = request.GET.get("range", None)
-        if time_range:
-            try:
-                time_range = int(time_range)
-            except ValueError:
-                time_range = None
 
-        # Fetch logs from Graylog
-        client = get_client()
-        config = settings.PLUGINS_CONFIG.get("netbox_graylog", {})
+@register_model_view(Interface, name="graylog_logs", path="logs")
+class InterfaceGraylogLogsView(generic.ObjectView):
+    """Display Graylog logs mentioning an Interface with async loading."""
 
-        if time_range:
-            # Build query with wildcard (Graylog wildcards are case-insensitive)
-            # Use VC name for virtual chassis members (original hostname)
-            hostname = device.virtual_chassis.name if device.virtual_chassis else device.name
-            query = f"source:{hostname}*"
-            logs_data = client.search_logs(query, time_range=time_range)
-            logs_data["search_type"] = "hostname"
-        else:
-            logs_data = client.get_logs_for_device(device)
+    queryset = Interface.objects.all()
+    template_name = "netbox_graylog/interface_logs_tab.html"
 
-        # Get external Graylog URL for browser links
-        graylog_base_url = config.get("graylog_external_url", config.get("graylog_url", "")).rstrip("/")
-
-        # Transform logs to rename _id to message_id (Django templates can't access underscore-prefixed attrs)
-        logs = []
-        for log in logs_data.get("messages", []):
-            transformed = {
-                "index": log.get("index", ""),
-                "message": {
-                    **log.get("message", {}),
-                    "message_id": log.get("message", {}).get("_id", ""),
-                },
-            }
-            logs.append(transformed)
+    tab = ViewTab(
+        label="Graylog",
+        weight=9004,
+        permission="dcim.view_interface",
+        hide_if_empty=False,
+    )
 
-        return HttpResponse(
-            render_to_string(
-                "netbox_graylog/logs_tab_content.html",
-                {
-                    "object": device,
-                    "logs": logs,
-                    "error": logs_data.get("error"),
-                    "total_results": logs_data.get("total_results", 0),
-                    "query": logs_data.get("query", ""),
-                    "time_range": logs_data.get("time_range", 3600),
-                    "search_type": logs_data.get("search_type", "hostname"),
-                    "graylog_base_url": graylog_base_url,
-                },
-                request=request,
-            )
+    def get(self, request, pk):
+        """Render initial tab with loading spinner - content loads via htmx."""
+        interface = Interface.objects.get(pk=pk)
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "object": interface,
+                "tab": self.tab,
+                "loading": True,
+                "content_params": content_params(request),
+            },
         )
 
 
+class InterfaceGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, GraylogContentMixin, View):
+    """HTMX endpoint returning the parent device's logs that mention an interface."""
+
+    permission_required = "dcim.view_interface"
+    queryset = Interface.objects.select_related("device")
+
+    def get_logs(self, client, interface, time_range):
+        return client.get_logs_for_interface(interface, time_range=time_range)
+
+
 @register_model_view(VirtualMachine, name="graylog_logs", path="logs")
 class VirtualMachineGraylogLogsView(generic.ObjectView):
     """Display Graylog logs for a VirtualMachine with async loading."""
@@ -144,8 +392,8 @@ class VirtualMachineGraylogLogsView(generic.ObjectView):
         """Render initial tab with loading spinner - content loads via htmx."""
         vm = VirtualMachine.objects.get(pk=pk)
 
-        # Pass time_range for htmx URL construction
-        time_range = request.GET.get("range", "")
+        # Pass range/collapse params for htmx URL construction
+        params = content_params(request)
 
         return render(
             request,
@@ -154,68 +402,47 @@ class VirtualMachineGraylogLogsView(generic.ObjectView):
                 "object": vm,
                 "tab": self.tab,
                 "loading": True,
-                "time_range_param": time_range,
+                "content_params": params,
             },
         )
 
 
-class VMGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class VMGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, GraylogContentMixin, View):
     """HTMX endpoint that returns Graylog content for VM async loading."""
 
     permission_required = "virtualization.view_virtualmachine"
+    queryset = VirtualMachine.objects.all()
 
-    def get(self, request, pk):
-        """Fetch Graylog logs and return HTML content."""
-        vm = VirtualMachine.objects.get(pk=pk)
+    def get_logs(self, client, vm, time_range):
+        return client.get_logs_for_vm(vm, time_range=time_range)
 
-        # Get time range from query params
-        time_range = request.GET.get("range", None)
-        if time_range:
-            try:
-                time_range = int(time_range)
-            except ValueError:
-                time_range = None
+    def get_host(self, client, vm):
+        return client.vm_host(vm)
 
-        # Fetch logs from Graylog
-        client = get_client()
-        config = settings.PLUGINS_CONFIG.get("netbox_graylog", {})
 
-        if time_range:
-            # Build query with wildcard (Graylog wildcards are case-insensitive)
-            hostname = vm.name
-            query = f"source:{hostname}*"
-            logs_data = client.search_logs(query, time_range=time_range)
-            logs_data["search_type"] = "hostname"
-        else:
-            logs_data = client.get_logs_for_vm(vm)
+class MessageDetailView(LoginRequiredMixin, View):
+    """HTMX endpoint that returns the full text of a single Graylog message."""
 
-        # Get external Graylog URL for browser links
-        graylog_base_url = config.get("graylog_external_url", config.get("graylog_url", "")).rstrip("/")
-
-        # Transform logs to rename _id to message_id (Django templates can't access underscore-prefixed attrs)
-        logs = []
-        for log in logs_data.get("messages", []):
-            transformed = {
-                "index": log.get("index", ""),
-                "message": {
-                    **log.get("message", {}),
-                    "message_id": log.get("message", {}).get("_id", ""),
-                },
-            }
-            logs.append(transformed)
+    # Messages may belong to any object type the plugin adds a tab to
+    view_permissions = (
+        "dcim.view_device",
+        "dcim.view_interface",
+        "virtualization.view_virtualmachine",
+        "netbox_endpoints.view_endpoint",
+    )
+
+    def get(self, request, index, message_id):
+        """Fetch one message by index and id and return HTML content."""
+        if not any(request.user.has_perm(perm) for perm in self.view_permissions):
+            return HttpResponse(status=403)
 
+        result = get_client().get_message(index, message_id)
         return HttpResponse(
             render_to_string(
-                "netbox_graylog/logs_tab_content.html",
+                "netbox_graylog/message_detail.html",
                 {
-                    "object": vm,
-                    "logs": logs,
-                    "error": logs_data.get("error"),
-                    "total_results": logs_data.get("total_results", 0),
-                    "query": logs_data.get("query", ""),
-                    "time_range": logs_data.get("time_range", 3600),
-                    "search_type": logs_data.get("search_type", "hostname"),
-                    "graylog_base_url": graylog_base_url,
+                    "message": result.get("message", {}),
+                    "error": result.get("error"),
                 },
                 request=request,
             )
@@ -302,69 +529,16 @@ class TestConnectionView(View):
 # Endpoint views - only available if netbox_endpoints is installed
 if ENDPOINTS_PLUGIN_INSTALLED:
 
-    class EndpointGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    class EndpointGraylogContentView(LoginRequiredMixin, PermissionRequiredMixin, GraylogContentMixin, View):
         """HTMX endpoint that returns Graylog content for Endpoint async loading."""
 
         permission_required = "netbox_endpoints.view_endpoint"
+        queryset = Endpoint.objects.all()
+        default_search_type = "name"
 
-        def get(self, request, pk):
-            """Fetch Graylog logs and return HTML content."""
-            endpoint = Endpoint.objects.get(pk=pk)
-
-            # Get time range from query params
-            time_range = request.GET.get("range", None)
-            if time_range:
-                try:
-                    time_range = int(time_range)
-                except ValueError:
-                    time_range = None
-
-            # Fetch logs from Graylog
-            client = get_client()
-            config = settings.PLUGINS_CONFIG.get("netbox_graylog", {})
-
-            # For endpoints, search by name or MAC address
-            search_term = endpoint.name if endpoint.name else str(endpoint.mac_address)
-
-            if time_range:
-                query = f"source:{search_term}*"
-                logs_data = client.search_logs(query, time_range=time_range)
-                logs_data["search_type"] = "name"
-            else:
-                # Default search by endpoint name/MAC
-                query = f"source:{search_term}*"
-                default_time_range = config.get("time_range", 3600)
-                logs_data = client.search_logs(query, time_range=default_time_range)
-                logs_data["search_type"] = "name"
-
-            # Get external Graylog URL for browser links
-            graylog_base_url = config.get("graylog_external_url", config.get("graylog_url", "")).rstrip("/")
-
-            # Transform logs to rename _id to message_id
-            logs = []
-            for log in logs_data.get("messages", []):
-                transformed = {
-                    "index": log.get("index", ""),
-                    "message": {
-                        **log.get("message", {}),
-                        "message_id": log.get("message", {}).get("_id", ""),
-                    },
-                }
-                logs.append(transformed)
-
-            return HttpResponse(
-                render_to_string(
-                    "netbox_graylog/logs_tab_content.html",
-                    {
-                        "object": endpoint,
-                        "logs": logs,
-                        "error": logs_data.get("error"),
-                        "total_results": logs_data.get("total_results", 0),
-                        "query": logs_data.get("query", ""),
-                        "time_range": logs_data.get("time_range", 3600),
-                        "search_type": logs_data.get("search_type", "name"),
-                        "graylog_base_url": graylog_base_url,
-                    },
-                    request=request,
-                )
-            )
+        def get_logs(self, client, endpoint, time_range):
+            # Searches by endpoint name or MAC address
+            return client.get_logs_for_endpoint(endpoint, time_range=time_range)
+
+        def get_host(self, client, endpoint):
+            return client.endpoint_host(endpoint)
@@ -1,6 +1,7 @@
 """Dashboard widgets for the NetBox Graylog plugin."""
 
 import logging
+from datetime import datetime, timezone
 
 from django import forms
 from django.template.loader import render_to_string
@@ -8,8 +9,6 @@ from django.utils.translation import gettext as _
 from extras.dashboard.utils import register_widget
 from extras.dashboard.widgets import DashboardWidget, WidgetConfigForm
 
-from .graylog_client import get_client
-
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +46,9 @@ class GraylogSummaryWidget(DashboardWidget):
         )
 
     def render(self, request):
+        # Imported here so registering the widget in ready() doesn't load the client
+        from .graylog_client import deadline, get_client
+
         client = get_client()
         if not client:
             return render_to_string(
@@ -56,10 +58,23 @@ class GraylogSummaryWidget(DashboardWidget):
 
         time_range = int(self.config.get("time_range", 3600))
         cache_timeout = self.config.get("cache_timeout", 120)
-        summary = client.get_log_summary(time_range=time_range, cache_timeout=cache_timeout)
+        budget = client.config.get("latency_budget", 2.0)
+        if budget:
+            # Past the budget, the last good summary (or a pending notice) is
+            # shown while the summary is fetched without a budget in the background
+            with deadline(budget):
+                summary = client.get_log_summary(time_range=time_range, cache_timeout=cache_timeout)
+        else:
+            summary = client.get_log_summary(time_range=time_range, cache_timeout=cache_timeout)
 
         if "error" in summary:
             return render_to_string(self.template_name, {"error": summary["error"]})
+        if summary.get("pending"):
+            return render_to_string(self.template_name, {"pending": True})
+
+        fetched_at = summary.get("fetched_at")
+        if fetched_at:
+            fetched_at = datetime.fromtimestamp(fetched_at, tz=timezone.utc)
 
         # Format time range for display
         if time_range < 3600:
@@ -77,6 +92,8 @@ class GraylogSummaryWidget(DashboardWidget):
                 "warnings": summary.get("warnings", 0),
                 "time_label": time_label,
                 "cached": summary.get("cached", False),
-                "graylog_url": client.config.get("graylog_external_url") or client.base_url,
+                "stale": summary.get("stale", False),
+                "fetched_at": fetched_at,
+                "graylog_url": client.external_url,
             },
         )